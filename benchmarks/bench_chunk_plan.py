@@ -0,0 +1,57 @@
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(".")
+
+from gptsenpy.PDFLoader import PDFLoader
+from gptsenpy.Tokenizer import Tokenizer
+
+DATA_PATH = Path("tests/data")
+
+
+def measure(name: str, func) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:40}: {elapsed * 1000:8.1f}ms, peak {peak / 1024:8.1f}KiB")
+    return result
+
+
+def main(model: str = "gpt-3.5-turbo", max_tokens: int = 256) -> None:
+    text = "\n".join(
+        PDFLoader(path).get_page_text(-1) for path in sorted(DATA_PATH.glob("*.pdf"))
+    )
+    tokenizer = Tokenizer(model)
+    print(f"{len(text)} chars")
+    # Warm up the encoder so that the first measurement does not include its setup.
+    tokenizer.count_tokens(text)
+
+    texts = measure(
+        "divide_text_by_max_token",
+        lambda: tokenizer.divide_text_by_max_token(text, max_tokens),
+    )
+    counts = measure(
+        "plan_chunks (counts)",
+        lambda: [chunk.n_tokens for chunk in tokenizer.plan_chunks(text, max_tokens)],
+    )
+    offsets = measure(
+        "plan_chunks (counts and offsets)",
+        lambda: [
+            (chunk.n_tokens, chunk.char_start, chunk.char_end)
+            for chunk in tokenizer.plan_chunks(text, max_tokens)
+        ],
+    )
+    plan_texts = measure(
+        "plan_chunks (texts)",
+        lambda: [chunk.text for chunk in tokenizer.plan_chunks(text, max_tokens)],
+    )
+    assert plan_texts == texts and len(counts) == len(offsets) == len(texts)
+
+
+if __name__ == "__main__":
+    main()
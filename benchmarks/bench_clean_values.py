@@ -0,0 +1,64 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(".")
+
+from gptsenpy.io import read_json
+from gptsenpy.utils import ValueCleaner, categorize_labels, clean_values
+from gptsenpy.utils.utils import DEFAULT_KEY, Num
+
+DATA_PATH = Path("tests/data")
+
+
+def clean_values_scan(dct: dict[str, Num], key_lst: list[str] = DEFAULT_KEY):
+    # The previous implementation of clean_values, which scans the whole key list.
+    ret_dct: dict[str, Num] = {}
+    for k in key_lst:
+        if k not in dct:
+            continue
+        v = dct[k]
+        if v is None or v is False:
+            continue
+        if isinstance(v, int | float | bool):
+            ret_dct[k] = v
+        else:
+            raise ValueError("Value must be a bool, int, or float")
+    return ret_dct
+
+
+def main(n: int = 200_000) -> None:
+    records = [
+        read_json(DATA_PATH / "annotation_format.json"),
+        read_json(
+            DATA_PATH / "DAMO-YOLO_A_Report_on_Real-Time_Object_Detection_Design.json"
+        ),
+        # A sparse model output with a few of the keys.
+        {"epochs": 300, "batchsize": 256, "optim-optimizer-Adam": True, "FPS": None},
+    ]
+    cleaner = ValueCleaner()
+    for record in records:
+        expected = clean_values_scan(record)
+        print(f"{len(record)} keys")
+        for name, func in [
+            ("scan (previous)", clean_values_scan),
+            ("clean_values", clean_values),
+            ("ValueCleaner", cleaner),
+        ]:
+            start = time.perf_counter()
+            for _ in range(n):
+                result = func(record)
+            elapsed = time.perf_counter() - start
+            assert result == expected and list(result) == list(expected)
+            print(f"  {name:16}: {elapsed / n * 1e6:.2f}us/record")
+
+    label_category = read_json(DATA_PATH / "label_category.json")
+    batch = records * (n // 100)
+    start = time.perf_counter()
+    categorize_labels(batch, label_category)
+    elapsed = time.perf_counter() - start
+    print(f"categorize_labels: {elapsed / len(batch) * 1e6:.2f}us/record")
+
+
+if __name__ == "__main__":
+    main()
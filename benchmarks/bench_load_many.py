@@ -0,0 +1,26 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(".")
+
+from gptsenpy.PDFLoader import PDFLoader
+
+DATA_PATH = Path("tests/data")
+
+
+def main(repeat: int = 8) -> None:
+    paths = sorted(DATA_PATH.glob("*.pdf")) * repeat
+    print(f"{len(paths)} documents")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        PDFLoader.load_many(paths, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"workers={workers:2d}: {elapsed:.3f}s")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
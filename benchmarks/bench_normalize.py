@@ -0,0 +1,51 @@
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+import fitz
+
+sys.path.append(".")
+
+from gptsenpy.PDFLoader import TextNormalizer
+
+DATA_PATH = Path("tests/data")
+
+
+def legacy(text: str) -> str:
+    return (" ".join(text.splitlines())).replace("- ", "")
+
+
+def peak_bytes_per_page(normalize, pages: list[str]) -> float:
+    total = 0
+    tracemalloc.start()
+    for page in pages:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        normalize(page)
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - before
+    tracemalloc.stop()
+    return total / len(pages)
+
+
+def main(number: int = 20) -> None:
+    pages = [
+        page.get_text()
+        for path in sorted(DATA_PATH.glob("*.pdf"))
+        for page in fitz.open(path)
+    ]
+    n_lines = sum(len(page.splitlines()) for page in pages)
+    print(f"{len(pages)} pages, {n_lines / len(pages):.1f} lines per page")
+
+    for name, normalize in [("legacy", legacy), ("TextNormalizer", TextNormalizer())]:
+        elapsed = timeit.timeit(
+            lambda: [normalize(page) for page in pages], number=number
+        )
+        per_page = elapsed / number / len(pages) * 1e6
+        peak = peak_bytes_per_page(normalize, pages) / 1024
+        print(f"{name:15s}: {per_page:6.2f} us/page, peak {peak:6.1f} KiB/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import sys
+import time
+from string import Template
+
+sys.path.append(".")
+
+from gptsenpy.Prompt import PromptTemplate
+
+TEMPLATE = """You are a helpful assistant reading a paper.
+
+Title: ${title}
+Section: ${section}
+
+${text}
+
+Answer the question "${question}" in JSON, e.g. {"answer": "...", "evidence": "..."}."""
+
+
+def substitute(replacer: dict) -> str:
+    # The previous implementation of PromptTemplate.build_prompt.
+    return Template(TEMPLATE).substitute(**replacer)
+
+
+def main(n: int = 200_000) -> None:
+    replacers = [
+        {
+            "title": f"Paper {i}",
+            "section": f"{i % 10}. Method",
+            "text": "Some text of the paper. " * 20,
+            "question": "What is the main contribution?",
+        }
+        for i in range(n)
+    ]
+    prompt_template = PromptTemplate(TEMPLATE)
+    compiled = prompt_template.compile()
+
+    results = {}
+    for name, func in [
+        ("Template.substitute", substitute),
+        ("build_prompt", prompt_template.build_prompt),
+        ("CompiledTemplate.render", compiled.render),
+    ]:
+        start = time.perf_counter()
+        results[name] = [func(replacer) for replacer in replacers]
+        elapsed = time.perf_counter() - start
+        print(f"{name:24}: {elapsed:.3f}s, {elapsed / n * 1e6:.2f}us/prompt")
+    assert len({tuple(prompts) for prompts in results.values()}) == 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(".")
+
+from gptsenpy.io import JSON_BACKENDS, json_backend, read_json
+
+DATA_PATH = Path("tests/data")
+
+
+def check_duplicate_keys_set(pairs):
+    # The previous duplicate key check of read_json.
+    assert len(pairs) == len(set([k for k, _ in pairs])), "Duplicate keys in JSON file."
+    return dict(pairs)
+
+
+def read_json_set(path: Path) -> dict:
+    with open(path, "r") as f:
+        return json.load(f, object_pairs_hook=check_duplicate_keys_set)
+
+
+def main(n: int = 5000) -> None:
+    sources = [
+        DATA_PATH / "annotation_format.json",
+        DATA_PATH / "Attention_Augmented_Convolutional_Networks.json",
+        DATA_PATH / "DAMO-YOLO_A_Report_on_Real-Time_Object_Detection_Design.json",
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(n):
+            path = Path(directory) / f"{i}.json"
+            shutil.copy(sources[i % len(sources)], path)
+            paths.append(path)
+        print(f"{n} files")
+
+        cases = [
+            ("list/set check (previous)", read_json_set),
+            ("dict check", read_json),
+        ]
+        for backend in JSON_BACKENDS:
+            try:
+                json_backend(backend)
+            except ImportError:
+                print(f"{backend} is not installed")
+                continue
+            cases.append(
+                (
+                    f"no check, {backend}",
+                    lambda path, backend=backend: read_json(
+                        path, check_duplicates=False, backend=backend
+                    ),
+                )
+            )
+
+        for name, func in cases:
+            start = time.perf_counter()
+            for path in paths:
+                func(path)
+            elapsed = time.perf_counter() - start
+            print(f"{name:26}: {elapsed:.3f}s, {elapsed / n * 1e6:.1f}us/file")
+
+
+if __name__ == "__main__":
+    main()
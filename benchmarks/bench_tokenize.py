@@ -0,0 +1,45 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(".")
+
+from gptsenpy.PDFLoader import PDFLoader
+from gptsenpy.Tokenizer import Tokenizer
+
+DATA_PATH = Path("tests/data")
+
+
+def tokenize_per_token(tokenizer: Tokenizer, text: str) -> list[str]:
+    # The previous implementation of Tokenizer.tokenize, which raised on split characters without errors="replace".
+    tokens = tokenizer.tokenizer.encode(text)
+    _tokens = [tokenizer.tokenizer.decode_single_token_bytes(token) for token in tokens]
+    return [token.decode("utf-8", "replace") for token in _tokens]
+
+
+def main(model: str = "gpt-3.5-turbo", repeat: int = 5) -> None:
+    texts = [
+        PDFLoader(path).get_page_text(-1) for path in sorted(DATA_PATH.glob("*.pdf"))
+    ]
+    tokenizer = Tokenizer(model)
+    n_tokens = sum(tokenizer.count_tokens(text) for text in texts)
+    print(f"{n_tokens} tokens")
+
+    for name, func in [
+        ("per-token decode", lambda text: tokenize_per_token(tokenizer, text)),
+        ("tokenize", tokenizer.tokenize),
+        ("tokenize_bytes", tokenizer.tokenize_bytes),
+        ("tokenize_with_offsets", tokenizer.tokenize_with_offsets),
+    ]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                func(text)
+        elapsed = (time.perf_counter() - start) / repeat
+        print(
+            f"{name:22}: {elapsed * 1000:7.1f}ms, {n_tokens / elapsed:12.0f} tokens/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
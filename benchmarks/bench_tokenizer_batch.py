@@ -0,0 +1,37 @@
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(".")
+
+from gptsenpy.PDFLoader import PDFLoader
+from gptsenpy.Tokenizer import Tokenizer
+
+DATA_PATH = Path("tests/data")
+
+
+def main(model: str = "gpt-3.5-turbo") -> None:
+    # Sentences of the bundled papers stand in for short prompts.
+    texts = [
+        sentence
+        for path in sorted(DATA_PATH.glob("*.pdf"))
+        for sentence in re.split(r"(?<=\.)\s+", PDFLoader(path).get_page_text(-1))
+    ]
+    tokenizer = Tokenizer(model)
+    print(f"{len(texts)} texts")
+
+    start = time.perf_counter()
+    expected = [tokenizer.count_tokens(text) for text in texts]
+    print(f"count_tokens loop           : {time.perf_counter() - start:.3f}s")
+
+    for num_threads in [1, 2, 4, 8]:
+        start = time.perf_counter()
+        counts = tokenizer.count_tokens_batch(texts, num_threads=num_threads)
+        elapsed = time.perf_counter() - start
+        assert counts == expected
+        print(f"count_tokens_batch threads={num_threads}: {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,5 @@
-from .pdfloader import PDFLoader
+from .cache import PDFCache
+from .layout import LayoutSection, TextBlock
+from .normalize import TextNormalizer
+from .pdfloader import SECTION_PATTERN, PDFLoader, Section
+from .pool import DocumentPool
@@ -0,0 +1,141 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+_SUFFIX = ".jsonl.gz"
+
+
+class PDFCache:
+    """
+    The PDFCache class stores the extracted page texts of PDF files on disk.
+
+    Entries are keyed by the content hash of the PDF file and the extraction options,
+    so an unchanged file is never parsed twice. Each entry is a gzip-compressed file
+    with one JSON string per page. When the total size of the entries exceeds
+    `max_bytes`, the least recently used entries are removed.
+
+    Attributes:
+        directory (Path): The directory where the entries are stored.
+        max_bytes (int): The maximum total size of the entries in bytes.
+        hits (int): The number of lookups that found an entry.
+        misses (int): The number of lookups that did not find an entry.
+    """
+
+    def __init__(self, directory: Path | str, max_bytes: int = 1 << 30):
+        """
+        Initializes the PDFCache with the provided directory.
+
+        Args:
+            directory (Path | str): The directory where the entries are stored. It is created if it does not exist.
+            max_bytes (int, optional): The maximum total size of the entries in bytes. Defaults to 1 GiB.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, path: Path | str, **options: Any) -> str:
+        """
+        Computes the key of a PDF file from its content and the extraction options.
+
+        Args:
+            path (Path | str): The path of the PDF file.
+            **options: The options which change the extracted text.
+
+        Returns:
+            str: The hex digest of the key.
+        """
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        h.update(json.dumps(options, sort_keys=True).encode())
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[list[str]]:
+        """
+        Returns the page texts stored for a key.
+
+        Args:
+            key (str): The key returned by `key`.
+
+        Returns:
+            Optional[list[str]]: The page texts, or None if there is no entry for the key,
+                                 or the entry is corrupt or removed by another process while it is read.
+        """
+        entry = self._entry(key)
+        try:
+            with gzip.open(entry, "rt", encoding="utf-8") as f:
+                pages = [json.loads(line) for line in f]
+        except (OSError, EOFError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(entry)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return pages
+
+    def put(self, key: str, pages: list[str]) -> None:
+        """
+        Stores the page texts for a key and evicts old entries if the cache is too large.
+
+        Args:
+            key (str): The key returned by `key`.
+            pages (list[str]): The page texts.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            # GzipFile does not close a file object it is given, so the raw file is closed, and
+            # flushed, by its own with statement before it is renamed.
+            with (
+                os.fdopen(fd, "wb") as raw,
+                gzip.open(raw, "wt", encoding="utf-8") as f,
+            ):
+                for page in pages:
+                    f.write(json.dumps(page, ensure_ascii=False))
+                    f.write("\n")
+            os.replace(tmp, self._entry(key))
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the total size is at most `max_bytes`.
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # Removed by another process evicting the same directory.
+                continue
+            entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        """
+        Removes all entries and resets the counters.
+        """
+        for entry in self.directory.glob(f"*{_SUFFIX}"):
+            entry.unlink(missing_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
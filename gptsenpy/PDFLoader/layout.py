@@ -0,0 +1,127 @@
+import re
+from collections import Counter
+from typing import Iterable, NamedTuple, Optional
+
+import fitz
+
+# Numbered headings such as "2.1. Related Work" or "A. Appendix", or a capitalized word such as "Abstract".
+_HEADING = re.compile(r"^(?:(?:[A-Z]|\d+)(?:\.\d+)*\.?\s+[A-Z]|[A-Z][a-z]+(?:\s|$))")
+_REFERENCES = re.compile(r"^(?:\S+\s+)?(?:references|bibliography)$", re.IGNORECASE)
+_BOLD = 1 << 4
+
+
+class TextBlock(NamedTuple):
+    """
+    A block of text on a PDF page.
+
+    Attributes:
+        text (str): The text of the block.
+        bbox (tuple[float, float, float, float]): The bounding box of the block (x0, y0, x1, y1).
+        pno (int): The page number of the block. The numbering starts from 1.
+        size (float): The most common font size in the block.
+        bold (bool): Whether all the text in the block is bold.
+    """
+
+    text: str
+    bbox: tuple[float, float, float, float]
+    pno: int
+    size: float
+    bold: bool
+
+
+class LayoutSection(NamedTuple):
+    """
+    A section of a PDF document detected from its layout.
+
+    Attributes:
+        title (Optional[str]): The heading of the section, or None for the text before the first heading.
+        text (str): The body text of the section.
+        pno (int): The page number where the section starts. The numbering starts from 1.
+    """
+
+    title: Optional[str]
+    text: str
+    pno: int
+
+
+def page_blocks(page: fitz.Page, margin: float = 0.08) -> list[TextBlock]:
+    """
+    Extracts the text blocks of a page, dropping page headers, footers and rotated text.
+
+    Args:
+        page (fitz.Page): The PDF page.
+        margin (float, optional): The fraction of the page height at the top and bottom where
+                                  blocks are regarded as headers or footers. Defaults to 0.08.
+
+    Returns:
+        list[TextBlock]: The text blocks in reading order. The text is not normalized.
+    """
+    height = page.rect.height
+    blocks = []
+    for block in page.get_text("dict")["blocks"]:
+        if block["type"] != 0:
+            continue
+        x0, y0, x1, y1 = block["bbox"]
+        if y1 <= height * margin or y0 >= height * (1 - margin):
+            continue
+        lines = [line for line in block["lines"] if line["dir"] == (1.0, 0.0)]
+        spans = [span for line in lines for span in line["spans"] if span["text"]]
+        if not spans:
+            continue
+        sizes: Counter = Counter()
+        for span in spans:
+            sizes[round(span["size"], 1)] += len(span["text"])
+        text = "\n".join(
+            "".join(span["text"] for span in line["spans"]) for line in lines
+        )
+        blocks.append(
+            TextBlock(
+                text,
+                (x0, y0, x1, y1),
+                page.number + 1,
+                sizes.most_common(1)[0][0],
+                all(span["flags"] & _BOLD for span in spans),
+            )
+        )
+    return blocks
+
+
+def body_size(blocks: Iterable[TextBlock]) -> float:
+    """
+    Returns the font size used for most of the text, which is regarded as the body text size.
+
+    Args:
+        blocks (Iterable[TextBlock]): The text blocks of a document.
+
+    Returns:
+        float: The body text size, or 0.0 if there is no text.
+    """
+    sizes: Counter = Counter()
+    for block in blocks:
+        sizes[block.size] += len(block.text)
+    return sizes.most_common(1)[0][0] if sizes else 0.0
+
+
+def is_heading(block: TextBlock, body: float, max_length: int = 120) -> bool:
+    """
+    Returns whether a text block is a section heading: short, bold, at least as large as the body text,
+    and either numbered or starting with a capitalized word.
+
+    Args:
+        block (TextBlock): The text block.
+        body (float): The body text size.
+        max_length (int, optional): The maximum number of characters of a heading. Defaults to 120.
+
+    Returns:
+        bool: Whether the block is a heading.
+    """
+    return (
+        block.bold
+        and block.size >= body
+        and len(block.text) <= max_length
+        and _HEADING.match(block.text) is not None
+    )
+
+
+def is_references(title: str) -> bool:
+    return _REFERENCES.match(title) is not None
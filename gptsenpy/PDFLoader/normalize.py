@@ -0,0 +1,81 @@
+import re
+from typing import Any
+
+# Line boundaries of str.splitlines other than "\n". PyMuPDF rarely emits them.
+_RARE_ASCII_LINE_BREAKS = "\r\x0b\x0c\x1c\x1d\x1e"
+_RARE_LINE_BREAKS = _RARE_ASCII_LINE_BREAKS + "\x85\u2028\u2029"
+_PARAGRAPH_BREAK = re.compile(r"\n[^\S\n]*\n\s*")
+_LIGATURES = str.maketrans(
+    {
+        "ﬀ": "ff",
+        "ﬁ": "fi",
+        "ﬂ": "fl",
+        "ﬃ": "ffi",
+        "ﬄ": "ffl",
+        "ﬅ": "ft",
+        "ﬆ": "st",
+    }
+)
+
+
+class TextNormalizer:
+    """
+    The TextNormalizer class normalizes the text extracted from a PDF page.
+
+    By default, line breaks are replaced with spaces and hyphenated line breaks are removed,
+    which is the text returned by `PDFLoader.get_page_text`.
+
+    Attributes:
+        dehyphenate (bool): Whether to remove hyphens followed by a space or a line break.
+        keep_paragraphs (bool): Whether to keep paragraph breaks (blank lines) as "\\n\\n".
+        fix_ligatures (bool): Whether to replace ligature characters such as "ﬁ" with plain letters.
+    """
+
+    def __init__(
+        self,
+        dehyphenate: bool = True,
+        keep_paragraphs: bool = False,
+        fix_ligatures: bool = False,
+    ):
+        self.dehyphenate = dehyphenate
+        self.keep_paragraphs = keep_paragraphs
+        self.fix_ligatures = fix_ligatures
+
+    def __call__(self, text: str) -> str:
+        """
+        Normalizes the text of a page.
+
+        Args:
+            text (str): The raw text of a page.
+
+        Returns:
+            str: The normalized text.
+        """
+        if self.fix_ligatures:
+            text = text.translate(_LIGATURES)
+        if self.keep_paragraphs:
+            return "\n\n".join(
+                self._join_lines(paragraph)
+                for paragraph in _PARAGRAPH_BREAK.split(text)
+            )
+        return self._join_lines(text)
+
+    @property
+    def options(self) -> dict[str, Any]:
+        return {
+            "dehyphenate": self.dehyphenate,
+            "keep_paragraphs": self.keep_paragraphs,
+            "fix_ligatures": self.fix_ligatures,
+        }
+
+    def _join_lines(self, text: str) -> str:
+        # A substring check per character is much faster than a regex search over the page,
+        # and str.isascii is O(1).
+        breaks = _RARE_ASCII_LINE_BREAKS if text.isascii() else _RARE_LINE_BREAKS
+        if any(c in text for c in breaks):
+            text = " ".join(text.splitlines())
+        else:
+            # Same as " ".join(text.splitlines()) without building a list of lines.
+            text = text[:-1] if text.endswith("\n") else text
+            text = text.replace("\n", " ")
+        return text.replace("- ", "") if self.dehyphenate else text
@@ -1,9 +1,73 @@
 import re
+import warnings
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, TypeVar
 
 import fitz
 
+from .cache import PDFCache
+from .layout import (
+    LayoutSection,
+    TextBlock,
+    body_size,
+    is_heading,
+    is_references,
+    page_blocks,
+)
+from .normalize import TextNormalizer
+from .pool import DocumentPool
+
+T = TypeVar("T")
+
+SECTION_PATTERN = r"(?<=\.\s)(?=\d+\.\s?[A-Z])"
+_LOOKBEHIND_CONTEXT = 256
+_LOOKAHEAD_CONTEXT = 256
+
+
+class Section(NamedTuple):
+    """
+    A section of a PDF document.
+
+    Attributes:
+        text (str): The text of the section without surrounding whitespace.
+        start (int): The offset of the first character of the section in the whole text.
+        end (int): The offset just after the last character of the section in the whole text.
+        start_pno (int): The page number where the section starts. The numbering starts from 1.
+        end_pno (int): The page number where the section ends.
+    """
+
+    text: str
+    start: int
+    end: int
+    start_pno: int
+    end_pno: int
+
+
+def _make_section(raw: str, start: int, page_starts: list[int]) -> Section:
+    text = raw.strip()
+    section_start = start + len(raw) - len(raw.lstrip())
+    section_end = section_start + len(text)
+    return Section(
+        text,
+        section_start,
+        section_end,
+        bisect_right(page_starts, section_start),
+        bisect_right(page_starts, max(section_end - 1, section_start)),
+    )
+
+
+def _group_sections(
+    m: re.Match, offset: int, page_starts: list[int]
+) -> Iterator[Section]:
+    # The groups of a match are sections of their own, as in re.split. A group which did not
+    # take part in the match is an empty section.
+    for i in range(1, m.re.groups + 1):
+        start = m.start(i) if m.start(i) >= 0 else m.start()
+        yield _make_section(m.group(i) or "", offset + start, page_starts)
+
 
 class PDFLoader:
     """
@@ -11,20 +75,72 @@ class PDFLoader:
 
     Attributes:
         path (Path): The path of the PDF file.
-        doc (fitz.fitz.Document): The PDF document object.
+        doc (fitz.fitz.Document): The PDF document object. It is opened on first access.
         page_count (int): The number of pages in the PDF document.
+        cache (Optional[PDFCache]): The cache of extracted page texts.
+        pool (Optional[DocumentPool]): The pool which owns the open document.
+        normalizer (TextNormalizer): The normalizer applied to the text of each page.
     """
 
-    def __init__(self, path: Path | str):
+    def __init__(
+        self,
+        path: Path | str,
+        cache: Optional[PDFCache] = None,
+        pool: Optional[DocumentPool] = None,
+        normalizer: Optional[TextNormalizer] = None,
+    ):
         """
-        Initializes the PDFLoader with the provided path.
+        Initializes the PDFLoader with the provided path. The PDF file is not opened until it is needed.
 
         Args:
             path (Path | str): The path of the PDF file.
+            cache (PDFCache, optional): The cache of extracted page texts. If given, the page texts
+                                        are read from the cache, or extracted once and stored in it.
+            pool (DocumentPool, optional): The pool of open documents. If given, the document is
+                                           borrowed from the pool instead of being owned by the loader.
+            normalizer (TextNormalizer, optional): The normalizer applied to the text of each page.
+                                                   If None, the default TextNormalizer is used.
         """
         self.path = Path(path)
-        self.doc: fitz.fitz.Document = fitz.open(self.path)
-        self.page_count = self.doc.page_count
+        self.cache = cache
+        self.pool = pool
+        self.normalizer = TextNormalizer() if normalizer is None else normalizer
+        self._doc: Optional[fitz.Document] = None
+        self._page_count: Optional[int] = None
+        self._pages: Optional[list[str]] = None
+        self._section_index: dict[str, list[Section]] = {}
+
+    def __enter__(self) -> "PDFLoader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def doc(self) -> fitz.Document:
+        if self.pool is not None:
+            return self.pool.get(self.path)
+        if self._doc is None:
+            self._doc = fitz.open(self.path)
+        return self._doc
+
+    @property
+    def page_count(self) -> int:
+        if self._page_count is None:
+            if self.cache is not None:
+                self._page_count = len(self._cached_pages())
+            else:
+                self._page_count = self.doc.page_count
+        return self._page_count
+
+    def close(self) -> None:
+        """
+        Closes the document owned by the loader. A document borrowed from a pool is left open.
+        The document is opened again if it is accessed after closing.
+        """
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
 
     def get_page_text(self, pno: int = -1) -> str:
         """
@@ -39,16 +155,9 @@ class PDFLoader:
             str: The extracted text.
         """
         if pno <= 0 or pno > self.page_count:
-            _texts = [
-                (" ".join(page.get_text().splitlines())).replace("- ", "")
-                for page in self.doc
-            ]
-            texts = " ".join(_texts)
-            return texts
+            return " ".join(self.iter_pages())
         else:
-            return (" ".join(self.doc.get_page_text(pno - 1).splitlines())).replace(
-                "- ", ""
-            )
+            return next(self.iter_pages(pno, pno))
 
     def get_page_text_by_range(
         self, start_pno: Optional[int], end_pno: Optional[int]
@@ -76,23 +185,48 @@ class PDFLoader:
         start_pno, end_pno = min(start_pno, end_pno), max(start_pno, end_pno)
         assert 1 <= start_pno <= end_pno <= self.page_count, "Invalid page range"
 
-        _texts = []
+        return " ".join(self.iter_pages(start_pno, end_pno))
 
-        for pno in range(start_pno - 1, end_pno):
-            _texts.append(
-                (" ".join(self.doc.get_page_text(pno).splitlines())).replace("- ", "")
-            )
+    def iter_pages(
+        self, start_pno: int = 1, end_pno: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Yields the text of a range of pages one page at a time.
+
+        Each page is normalized by `normalizer` in the same way as `get_page_text`.
+        Only one page is held in memory unless a cache is used.
+
+        Args:
+            start_pno (int): The first page number to extract. The numbering starts from 1. Defaults to 1.
+            end_pno (int, optional): The last page number to extract. If None, it defaults to the total number of pages in the document.
+
+        Yields:
+            str: The text of each page.
+
+        Raises:
+            AssertionError: If the provided page range is invalid.
+        """
+        end_pno = self.page_count if end_pno is None else end_pno
+        assert 1 <= start_pno <= end_pno <= self.page_count, "Invalid page range"
 
-        texts = " ".join(_texts)
-        return texts
+        if self.cache is not None:
+            yield from self._cached_pages()[start_pno - 1 : end_pno]
+            return
+
+        for pno in range(start_pno - 1, end_pno):
+            yield self._extract_page(pno)
 
     def split_sections(
         self,
-        pattern: str = r"(?<=\.\s)(?=\d+\.\s?[A-Z])",
+        pattern: str = SECTION_PATTERN,
     ) -> list[str]:
         """
         Splits the text from the PDF document into sections based on a regex pattern.
 
+        The sections are indexed once per pattern by `section_index`, so repeated calls do not
+        extract or split the document again. As in `re.split`, the text of each capturing group in
+        the pattern is a section of its own.
+
         Args:
             pattern (str): The regex pattern used for splitting the text into sections.
                                       Defaults to r"(?<=\.\s)(?=\d+\.\s?[A-Z])".
@@ -100,7 +234,289 @@ class PDFLoader:
         Returns:
             list[str]: A list of text sections.
         """
-        text = self.get_page_text(-1)
-        sections = re.split(pattern, text)
-        sections = [section.strip() for section in sections]
+        return [section.text for section in self.section_index(pattern)]
+
+    def get_section(self, index: int, pattern: str = SECTION_PATTERN) -> Section:
+        """
+        Returns a single section of the PDF document from the section index.
+
+        Args:
+            index (int): The index of the section. Negative values count from the end.
+            pattern (str): The regex pattern used for splitting the text into sections.
+                                      Defaults to SECTION_PATTERN.
+
+        Returns:
+            Section: The section with its text, character offsets and page numbers.
+        """
+        return self.section_index(pattern)[index]
+
+    def section_index(self, pattern: str = SECTION_PATTERN) -> list[Section]:
+        """
+        Returns the sections of the PDF document with their character offsets and page numbers.
+
+        The index is built on the first call for each pattern, by a single pass of the pattern over
+        the whole text, and cached on the loader.
+
+        Args:
+            pattern (str): The regex pattern used for splitting the text into sections.
+                                      Defaults to SECTION_PATTERN.
+
+        Returns:
+            list[Section]: The sections in document order. The offsets refer to `get_page_text(-1)`.
+        """
+        if pattern not in self._section_index:
+            pages = list(self.iter_pages())
+            page_starts = []
+            offset = 0
+            for page in pages:
+                page_starts.append(offset)
+                offset += len(page) + 1
+            text = " ".join(pages)
+            sections = []
+            start = 0
+            for m in re.finditer(pattern, text):
+                sections.append(
+                    _make_section(text[start : m.start()], start, page_starts)
+                )
+                sections.extend(_group_sections(m, 0, page_starts))
+                start = m.end()
+            sections.append(_make_section(text[start:], start, page_starts))
+            self._section_index[pattern] = sections
+        return self._section_index[pattern]
+
+    def iter_sections(
+        self,
+        pattern: str = SECTION_PATTERN,
+    ) -> Iterator[str]:
+        """
+        Yields the sections of the PDF document one at a time while reading it page by page.
+
+        The result is the same as `split_sections`, but only the current section and the
+        latest page are held in memory, and each page is scanned once. A match of `pattern`
+        may extend at most one page ahead, and its lookarounds may reach at most 256 characters.
+
+        Args:
+            pattern (str): The regex pattern used for splitting the text into sections.
+                                      Defaults to SECTION_PATTERN.
+
+        Yields:
+            str: Each text section.
+        """
+        if pattern in self._section_index:
+            yield from self.split_sections(pattern)
+            return
+        for section in self._scan_sections(pattern):
+            yield section.text
+
+    def _scan_sections(self, pattern: str) -> Iterator[Section]:
+        regex = re.compile(pattern)
+        pieces: list[tuple[int, str]] = (
+            []
+        )  # pages from the current section, with offsets
+        window = ""  # text of the document from offset `base`, around the scan position
+        base = 0
+        start = 0  # offset where the current section starts
+        resume = 0  # offset where the next scan starts; text before it is final
+        last_empty = -1  # offset of the last accepted empty match
+        page_starts: list[int] = []
+
+        def section(end: int) -> Section:
+            if start >= base:
+                raw = window[start - base : end - base]
+            else:
+                first = bisect_right(pieces, start, key=lambda piece: piece[0]) - 1
+                offset = pieces[first][0]
+                raw = "".join(piece for _, piece in pieces[first:])
+                raw = raw[start - offset : end - offset]
+            return _make_section(raw, start, page_starts)
+
+        def scan(limit: float) -> Iterator[Section]:
+            nonlocal start, resume, last_empty
+            deferred = float("inf")
+            for m in regex.finditer(window, resume - base):
+                if base + m.end() > limit:
+                    deferred = base + m.start()
+                    break
+                if m.start() == m.end():
+                    if base + m.start() == last_empty:
+                        continue
+                    last_empty = base + m.start()
+                yield section(base + m.start())
+                yield from _group_sections(m, base, page_starts)
+                start = base + m.end()
+            # A failed match near the end of the window may succeed once the next page is added.
+            end = base + len(window) - _LOOKAHEAD_CONTEXT
+            resume = int(max(resume, start, min(deferred, end)))
+
+        for i, page in enumerate(self.iter_pages()):
+            limit = base + len(window)
+            piece = page if i == 0 else " " + page
+            pieces.append((limit, piece))
+            page_starts.append(limit + len(piece) - len(page))
+            trim = max(resume - _LOOKBEHIND_CONTEXT - base, 0)
+            window, base = window[trim:] + piece, base + trim
+            # Matches in earlier pages are final once the next page is available.
+            if i > 0:
+                yield from scan(limit)
+            while len(pieces) > 1 and pieces[1][0] <= start:
+                del pieces[0]
+
+        yield from scan(float("inf"))
+        yield section(base + len(window))
+
+    def iter_blocks(
+        self, start_pno: int = 1, end_pno: Optional[int] = None, margin: float = 0.08
+    ) -> Iterator[TextBlock]:
+        """
+        Yields the text blocks of a range of pages using MuPDF's block-level output.
+
+        Page headers, footers and rotated text (e.g. arXiv stamps) are dropped, and the
+        text of each block is normalized by `normalizer`.
+
+        Args:
+            start_pno (int): The first page number to extract. The numbering starts from 1. Defaults to 1.
+            end_pno (int, optional): The last page number to extract. If None, it defaults to the total number of pages in the document.
+            margin (float, optional): The fraction of the page height at the top and bottom where
+                                      blocks are regarded as headers or footers. Defaults to 0.08.
+
+        Yields:
+            TextBlock: Each text block with its bounding box, page number and font size.
+
+        Raises:
+            AssertionError: If the provided page range is invalid.
+        """
+        end_pno = self.page_count if end_pno is None else end_pno
+        assert 1 <= start_pno <= end_pno <= self.page_count, "Invalid page range"
+
+        for pno in range(start_pno - 1, end_pno):
+            for block in page_blocks(self.doc[pno], margin):
+                yield block._replace(text=self.normalizer(block.text))
+
+    def layout_sections(
+        self,
+        skip_references: bool = True,
+        margin: float = 0.08,
+        min_size_ratio: float = 0.9,
+    ) -> list[LayoutSection]:
+        """
+        Splits the PDF document into sections using the headings detected from the layout
+        instead of a regex over the whole text.
+
+        Headings are bold blocks at least as large as the body text. Blocks with much smaller
+        text than the body, such as the labels of figures, are dropped.
+
+        Args:
+            skip_references (bool, optional): Whether to drop the reference list. Defaults to True.
+            margin (float, optional): The fraction of the page height at the top and bottom where
+                                      blocks are regarded as headers or footers. Defaults to 0.08.
+            min_size_ratio (float, optional): Blocks with a font size smaller than this ratio of the
+                                              body text size are dropped. Defaults to 0.9.
+
+        Returns:
+            list[LayoutSection]: The sections in document order. The text before the first heading,
+                                 such as the title and the authors, has no title.
+        """
+        blocks = list(self.iter_blocks(margin=margin))
+        body = body_size(blocks)
+
+        sections = [LayoutSection(None, "", 1)]
+        texts: list[list[str]] = [[]]
+        for block in blocks:
+            if is_heading(block, body):
+                sections.append(LayoutSection(block.text, "", block.pno))
+                texts.append([])
+            elif block.size >= body * min_size_ratio:
+                texts[-1].append(block.text)
+
+        sections = [
+            section._replace(text=" ".join(section_texts))
+            for section, section_texts in zip(sections, texts)
+            if not (skip_references and section.title and is_references(section.title))
+        ]
+        if not sections[0].text:
+            sections = sections[1:]
         return sections
+
+    def _extract_page(self, pno: int) -> str:
+        return self.normalizer(self.doc.get_page_text(pno))
+
+    def _cached_pages(self) -> list[str]:
+        assert self.cache is not None
+        if self._pages is None:
+            key = self.cache.key(self.path, **self.normalizer.options)
+            pages = self.cache.get(key)
+            if pages is None:
+                pages = [self._extract_page(pno) for pno in range(self.doc.page_count)]
+                self.cache.put(key, pages)
+            self._pages = pages
+        return self._pages
+
+    @staticmethod
+    def load_many(
+        paths: Iterable[Path | str],
+        workers: Optional[int] = None,
+        cache: Optional[PDFCache] = None,
+    ) -> list[Optional[str]]:
+        """
+        Extracts the text of many PDF files in parallel with a process pool.
+
+        Args:
+            paths (Iterable[Path | str]): The paths of the PDF files.
+            workers (int, optional): The number of worker processes. If None, the number
+                                     of CPUs is used. If 1, files are loaded in this process.
+            cache (PDFCache, optional): The cache of extracted page texts shared by the workers.
+                                        The hits and misses of the workers are added to its counters.
+
+        Returns:
+            list[Optional[str]]: The text of each document in the order of `paths`.
+                                 None is returned for files that could not be loaded,
+                                 and a warning is issued for each of them.
+        """
+        pdf_paths = [Path(path) for path in paths]
+        if workers == 1 or len(pdf_paths) <= 1:
+            return [
+                _text_or_none(path, partial(_load_text, path, cache))
+                for path in pdf_paths
+            ]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_load_text_counted, path, cache) for path in pdf_paths
+            ]
+            texts: list[Optional[str]] = []
+            for path, future in zip(pdf_paths, futures):
+                result = _text_or_none(path, future.result)
+                if result is None:
+                    texts.append(None)
+                    continue
+                text, hits, misses = result
+                if cache is not None:
+                    cache.hits += hits
+                    cache.misses += misses
+                texts.append(text)
+            return texts
+
+
+def _load_text(path: Path, cache: Optional[PDFCache] = None) -> str:
+    with PDFLoader(path, cache) as pdfloader:
+        return pdfloader.get_page_text(-1)
+
+
+def _load_text_counted(
+    path: Path, cache: Optional[PDFCache] = None
+) -> tuple[str, int, int]:
+    # A worker process has its own copy of the cache, so the changes of its counters are
+    # returned to be added to the cache of the parent.
+    if cache is None:
+        return _load_text(path), 0, 0
+    hits, misses = cache.hits, cache.misses
+    text = _load_text(path, cache)
+    return text, cache.hits - hits, cache.misses - misses
+
+
+def _text_or_none(path: Path, load: Callable[[], T]) -> Optional[T]:
+    try:
+        return load()
+    except Exception as e:
+        warnings.warn(f"Failed to load '{path}': {e}")
+        return None
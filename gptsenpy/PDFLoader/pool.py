@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from pathlib import Path
+
+import fitz
+
+
+class DocumentPool:
+    """
+    The DocumentPool class keeps a bounded number of PDF documents open and shares them between loaders.
+
+    When more than `maxsize` documents are open, the least recently used one is closed.
+    A closed document is opened again on its next access.
+
+    The pool is not thread-safe and must be used, with the loaders sharing it, from a single thread.
+    A document returned by `get` may be closed by a later `get` of another file, so it should not be
+    kept after that; PDFLoader looks its document up again on every access. PyMuPDF does not support
+    using documents from several threads either. For parallel extraction, use `PDFLoader.load_many`,
+    whose worker processes open their own documents.
+
+    Attributes:
+        maxsize (int): The maximum number of open documents.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        """
+        Initializes the DocumentPool with the provided size.
+
+        Args:
+            maxsize (int, optional): The maximum number of open documents. Defaults to 64.
+        """
+        assert maxsize >= 1, "'maxsize' must be positive"
+        self.maxsize = maxsize
+        self._docs: OrderedDict[Path, fitz.Document] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, path: Path | str) -> bool:
+        return Path(path) in self._docs
+
+    def __enter__(self) -> "DocumentPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get(self, path: Path | str) -> fitz.Document:
+        """
+        Returns the open document of a PDF file, opening it if necessary.
+
+        Args:
+            path (Path | str): The path of the PDF file.
+
+        Returns:
+            fitz.Document: The PDF document object.
+        """
+        path = Path(path)
+        if path in self._docs:
+            self._docs.move_to_end(path)
+            return self._docs[path]
+        doc = fitz.open(path)
+        self._docs[path] = doc
+        while len(self._docs) > self.maxsize:
+            _, evicted = self._docs.popitem(last=False)
+            evicted.close()
+        return doc
+
+    def release(self, path: Path | str) -> None:
+        """
+        Closes the document of a PDF file if it is open.
+
+        Args:
+            path (Path | str): The path of the PDF file.
+        """
+        doc = self._docs.pop(Path(path), None)
+        if doc is not None:
+            doc.close()
+
+    def close(self) -> None:
+        """
+        Closes all open documents.
+        """
+        while self._docs:
+            _, doc = self._docs.popitem()
+            doc.close()
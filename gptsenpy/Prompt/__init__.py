@@ -1 +1,4 @@
-from .prompt import PromptTemplate
+from .compiled import CompiledTemplate
+from .planner import PromptBudgetPlanner
+from .prompt import PromptResult, PromptTemplate
+from .registry import TemplateRegistry
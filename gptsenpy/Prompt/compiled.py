@@ -0,0 +1,95 @@
+from string import Template
+from typing import Optional
+
+
+class CompiledTemplate:
+    """
+    The CompiledTemplate class is a template string parsed once into literal and placeholder segments.
+
+    The template follows the syntax of `string.Template`. It is converted to a `str.format` string, so that
+    a prompt is rendered by a single `format_map` call instead of a regex substitution.
+
+    Attributes:
+        template (str): The template string.
+        placeholders (tuple[str, ...]): The names of the placeholders in order of appearance, without duplicates.
+        keys (frozenset[str]): The names of the placeholders.
+    """
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        self._segments: list[tuple[str, Optional[str]]] = []
+        # The offset of the first ill-formed placeholder, if any.
+        self._invalid: Optional[int] = None
+        literal = []
+        start = 0
+        for m in Template.pattern.finditer(template):
+            literal.append(template[start : m.start()])
+            start = m.end()
+            if m.group("escaped") is not None:
+                literal.append(Template.delimiter)
+            elif m.group("invalid") is not None:
+                self._invalid = m.start()
+                break
+            else:
+                self._segments.append(
+                    ("".join(literal), m.group("named") or m.group("braced"))
+                )
+                literal = []
+        if self._invalid is None:
+            literal.append(template[start:])
+        self._segments.append(("".join(literal), None))
+
+        self.placeholders = tuple(
+            dict.fromkeys(name for _, name in self._segments if name)
+        )
+        self.keys = frozenset(self.placeholders)
+        self._format = "".join(
+            text.replace("{", "{{").replace("}", "}}")
+            + ("{" + name + "}" if name else "")
+            for text, name in self._segments
+        )
+
+    @property
+    def segments(self) -> list[tuple[str, Optional[str]]]:
+        """
+        The segments of the template as pairs of a literal text and the name of the placeholder after it.
+        The name of the last segment is None.
+        """
+        return list(self._segments)
+
+    def missing(self, replacer: dict) -> list[str]:
+        """
+        Returns the placeholders which are not in a replacer.
+
+        Args:
+            replacer (dict): The values of the placeholders.
+
+        Returns:
+            list[str]: The names of the missing placeholders in order of appearance.
+        """
+        if self.keys <= replacer.keys():
+            return []
+        return [name for name in self.placeholders if name not in replacer]
+
+    def render(self, replacer: dict) -> str:
+        """
+        Builds a prompt string by replacing placeholders with values from a dictionary, as `Template.substitute` does.
+
+        Args:
+            replacer (dict): A dictionary containing key-value pairs where the keys are placeholders in the template
+                             string and the values are the values to replace them with.
+
+        Returns:
+            str: The prompt string with all placeholders replaced with their corresponding values.
+
+        Raises:
+            KeyError: If replacer does not have enough keys.
+            ValueError: If the template string is invalid and cannot be substituted.
+        """
+        try:
+            prompt = self._format.format_map(replacer)
+        except KeyError as e:
+            raise KeyError(f"Invalid template: Missing placeholder '{e.args[0]}'")
+        if self._invalid is not None:
+            raise ValueError("Invalid template")
+        return prompt
@@ -0,0 +1,164 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+from ..Tokenizer import SENTENCE_PATTERN, Chunk, Tokenizer
+from .prompt import PromptTemplate
+
+
+class PromptBudgetPlanner:
+    """
+    The PromptBudgetPlanner class plans how much of a document fits in the prompts built from a template.
+
+    The tokens of the template without the document, i.e. its fixed overhead, are counted once for each set of
+    the other replacer values and cached, so that the document is encoded only once when it is divided.
+
+    Attributes:
+        template (PromptTemplate): The prompt template.
+        tokenizer (Tokenizer): The tokenizer of the model.
+        context_size (int): The number of tokens of the context window of the model.
+        completion_tokens (int): The number of tokens reserved for the completion.
+        slot (str): The placeholder of the template which is filled with the document.
+        margin (int): The number of tokens reserved for the tokens which merge across the boundaries between
+                      the document and the template, which are not in the separate counts.
+        maxsize (int): The maximum number of cached overheads.
+    """
+
+    def __init__(
+        self,
+        template: PromptTemplate,
+        tokenizer: Tokenizer,
+        context_size: int,
+        completion_tokens: int = 0,
+        slot: str = "text",
+        margin: int = 4,
+        maxsize: int = 1024,
+    ) -> None:
+        self.template = template
+        self.tokenizer = tokenizer
+        self.context_size = context_size
+        self.completion_tokens = completion_tokens
+        self.slot = slot
+        self.margin = margin
+        self.maxsize = maxsize
+        self._overheads: OrderedDict[tuple, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def overhead(self, replacer: Optional[dict] = None) -> int:
+        """
+        Returns the number of tokens of the prompt with an empty document.
+
+        The overhead is cached by the text of each value, so the values need not be hashable.
+
+        Args:
+            replacer (Optional[dict], optional): The values of the placeholders. The value of the slot,
+                                                 if any, is ignored. Defaults to None.
+
+        Returns:
+            int: The number of tokens of the fixed part of the prompt.
+
+        Raises:
+            KeyError: If replacer does not have enough keys.
+        """
+        # The prompt is rendered from the text of the values, so equal texts give the same overhead.
+        key = tuple(
+            sorted((k, str(v)) for k, v in (replacer or {}).items() if k != self.slot)
+        )
+        with self._lock:
+            n_tokens = self._overheads.get(key)
+            if n_tokens is not None:
+                self._overheads.move_to_end(key)
+                return n_tokens
+        prompt = self.template.build_prompt({**(replacer or {}), self.slot: ""})
+        n_tokens = self.tokenizer.count_tokens(prompt)
+        with self._lock:
+            self._overheads[key] = n_tokens
+            while len(self._overheads) > self.maxsize:
+                self._overheads.popitem(last=False)
+        return n_tokens
+
+    def budget(self, replacer: Optional[dict] = None) -> int:
+        """
+        Returns the number of tokens of the document which fit in a prompt.
+
+        Args:
+            replacer (Optional[dict], optional): The values of the placeholders other than the slot. Defaults to None.
+
+        Returns:
+            int: The number of tokens left for the document in the context window.
+
+        Raises:
+            ValueError: If the template and the reserved tokens do not fit in the context window.
+        """
+        budget = (
+            self.context_size
+            - self.completion_tokens
+            - self.overhead(replacer)
+            - self.margin
+        )
+        if budget <= 0:
+            raise ValueError("The template does not fit in the context window")
+        return budget
+
+    def split(
+        self,
+        text: str,
+        replacer: Optional[dict] = None,
+        overlap: int = 0,
+        patterns: Sequence[str] = (SENTENCE_PATTERN,),
+    ) -> list[Chunk]:
+        """
+        Divides a document into chunks each of which fits in a prompt, encoding the document once.
+
+        Args:
+            text (str): The document.
+            replacer (Optional[dict], optional): The values of the placeholders other than the slot. Defaults to None.
+            overlap (int, optional): The number of overlapping tokens between chunks,
+                                     as in `Tokenizer.divide_text_by_boundary`. Defaults to 0.
+            patterns (Sequence[str], optional): The regex patterns of the boundaries,
+                                                as in `Tokenizer.divide_text_by_boundary`. Defaults to (SENTENCE_PATTERN,).
+
+        Returns:
+            list[Chunk]: The chunks of the document.
+        """
+        return self.tokenizer.divide_text_by_boundary(
+            text, self.budget(replacer), overlap, patterns
+        )
+
+    def pack(
+        self,
+        texts: list[str],
+        replacer: Optional[dict] = None,
+        separator: str = "\n\n",
+    ) -> list[str]:
+        """
+        Joins consecutive texts, such as the sections of a paper, into as few documents as fit in the prompts.
+
+        Each text is counted once, and a text which does not fit in a prompt by itself is divided by `split`
+        into documents of its own.
+
+        Args:
+            texts (list[str]): The texts.
+            replacer (Optional[dict], optional): The values of the placeholders other than the slot. Defaults to None.
+            separator (str, optional): The separator between the joined texts. Defaults to "\\n\\n".
+
+        Returns:
+            list[str]: The documents, each of which fits in a prompt.
+        """
+        budget = self.budget(replacer)
+        separator_tokens = self.tokenizer.count_tokens(separator)
+        documents: list[str] = []
+        group: list[str] = []
+        n_tokens = 0
+        for text, count in zip(texts, self.tokenizer.count_tokens_batch(texts)):
+            if group and n_tokens + separator_tokens + count > budget:
+                documents.append(separator.join(group))
+                group, n_tokens = [], 0
+            if count > budget:
+                documents.extend(chunk.text for chunk in self.split(text, replacer))
+                continue
+            n_tokens += count + (separator_tokens if group else 0)
+            group.append(text)
+        if group:
+            documents.append(separator.join(group))
+        return documents
@@ -1,5 +1,27 @@
 import warnings
-from string import Template
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, Mapping, NamedTuple, Optional, Sequence, Union
+
+from ..Tokenizer import Tokenizer
+from .compiled import CompiledTemplate
+
+
+class PromptResult(NamedTuple):
+    """
+    The result of rendering a replacer in `PromptTemplate.build_prompts`.
+
+    Attributes:
+        row (int): The index of the replacer.
+        prompt (Optional[str]): The prompt string, or None if it could not be built.
+        error (Optional[Exception]): The error raised while building the prompt, if any, e.g. the KeyError
+                                     of a missing placeholder.
+    """
+
+    row: int
+    prompt: Optional[str]
+    error: Optional[Exception]
 
 
 class PromptTemplate:
@@ -7,6 +29,7 @@ class PromptTemplate:
         if not template:
             warnings.warn("Template is empty!!")
         self.__template: str = template
+        self.__compiled: Optional[CompiledTemplate] = None
 
     @property
     def template(self):
@@ -15,6 +38,18 @@ class PromptTemplate:
     @template.setter
     def template(self, template):
         self.__template = template
+        self.__compiled = None
+
+    def compile(self) -> CompiledTemplate:
+        """
+        Returns the compiled form of the template, which is parsed on the first call after the template is set.
+
+        Returns:
+            CompiledTemplate: The template parsed into literal and placeholder segments.
+        """
+        if self.__compiled is None:
+            self.__compiled = CompiledTemplate(self.__template)
+        return self.__compiled
 
     def build_prompt(self, replacer: dict) -> str:
         """
@@ -38,11 +73,170 @@ class PromptTemplate:
             'Hello, my name is John and I am 30 years old.'
         """
 
-        template = Template(self.__template)
+        return self.compile().render(replacer)
 
+    def build_prompt_with_budget(
+        self,
+        replacer: dict,
+        tokenizer: Tokenizer,
+        max_tokens: Optional[int] = None,
+        budgets: Optional[dict[str, int]] = None,
+        priority: Optional[Sequence[str]] = None,
+    ) -> tuple[str, int]:
+        """
+        Builds a prompt string whose slots are truncated to token budgets, and counts its tokens.
+
+        The value of each slot in `budgets` is truncated to its budget. If `max_tokens` is given, the slots in
+        `priority` are filled in that order with as many tokens as are left in the prompt, so that lower priority
+        slots are truncated first. Each truncated value is encoded once.
+
+        Args:
+            replacer (dict): The values of the placeholders.
+            tokenizer (Tokenizer): The tokenizer of the model.
+            max_tokens (Optional[int], optional): The maximum number of tokens of the prompt. Defaults to None.
+            budgets (Optional[dict[str, int]], optional): The maximum number of tokens of each slot. Defaults to None.
+            priority (Optional[Sequence[str]], optional): The slots which are truncated to fit in `max_tokens`,
+                                                          from the highest priority. Defaults to the slots in `budgets`.
+
+        Returns:
+            tuple[str, int]: The prompt string and its number of tokens.
+
+        Raises:
+            KeyError: If replacer does not have enough keys.
+            ValueError: If the template string is invalid, or the prompt does not fit in `max_tokens`
+                        even with the slots in `priority` empty.
+        """
+        budgets = budgets or {}
+        slots = list(priority) if priority is not None else list(budgets)
+        if max_tokens is None:
+            slots = [slot for slot in slots if slot in budgets]
+        for slot in set(slots) | set(budgets):
+            if slot not in replacer:
+                raise KeyError(f"Invalid template: Missing placeholder '{slot}'")
+
+        encoding = tokenizer.tokenizer
+        tokens = {
+            slot: encoding.encode(str(replacer[slot]))
+            for slot in dict.fromkeys([*slots, *budgets])
+        }
+        limits = {
+            slot: min(len(slot_tokens), budgets.get(slot, len(slot_tokens)))
+            for slot, slot_tokens in tokens.items()
+        }
+        if max_tokens is not None:
+            fixed = {slot: replacer[slot] for slot in budgets if slot not in slots}
+            empty = {slot: "" for slot in slots}
+            fixed_replacer = {
+                **replacer,
+                **empty,
+                **self._truncate(encoding, fixed, tokens, limits),
+            }
+            remaining = max_tokens - tokenizer.count_tokens(
+                self.build_prompt(fixed_replacer)
+            )
+            if remaining < 0:
+                raise ValueError("The template does not fit in the token budget")
+            for slot in slots:
+                limits[slot] = min(limits[slot], remaining)
+                remaining -= limits[slot]
+
+        while True:
+            truncated = self._truncate(encoding, replacer, tokens, limits)
+            prompt = self.build_prompt({**replacer, **truncated})
+            n_tokens = tokenizer.count_tokens(prompt)
+            if max_tokens is None or n_tokens <= max_tokens:
+                return prompt, n_tokens
+            if not any(limits[slot] for slot in slots):
+                raise ValueError("The template does not fit in the token budget")
+            # Tokens merged across the boundaries of the slots; give up the excess from the lowest priority.
+            excess = n_tokens - max_tokens
+            for slot in reversed(slots):
+                cut = min(excess, limits[slot])
+                limits[slot] -= cut
+                excess -= cut
+
+    @staticmethod
+    def _truncate(
+        encoding, replacer: dict, tokens: dict[str, list[int]], limits: dict[str, int]
+    ) -> dict[str, str]:
+        truncated = {}
+        for slot, limit in limits.items():
+            if slot not in replacer:
+                continue
+            if limit >= len(tokens[slot]):
+                truncated[slot] = str(replacer[slot])
+            else:
+                # Drop the bytes of a character split by the last token.
+                truncated[slot] = encoding.decode_bytes(tokens[slot][:limit]).decode(
+                    "utf-8", "ignore"
+                )
+        return truncated
+
+    def build_prompts(
+        self,
+        replacers: Union[Iterable[dict], Mapping[str, Sequence]],
+        workers: int = 1,
+        batch_size: int = 1024,
+    ) -> Iterator[PromptResult]:
+        """
+        Builds prompt strings for many replacers lazily, reporting the replacers which fail instead of raising.
+
+        Args:
+            replacers (Union[Iterable[dict], Mapping[str, Sequence]]): The replacers, or a mapping from each
+                placeholder to the list of its values, e.g. {"title": titles, "text": texts}.
+            workers (int, optional): The number of worker processes. If 1, prompts are built in this process.
+                                     Defaults to 1.
+            batch_size (int, optional): The number of replacers sent to a worker process at once. Defaults to 1024.
+
+        Yields:
+            PromptResult: The index of each replacer with its prompt string, or with the error raised by
+                          `build_prompt` for it, in the order of `replacers`.
+
+        Raises:
+            ValueError: If the columns of a mapping of values do not have the same length.
+        """
+        rows = _rows(replacers)
+        if workers == 1:
+            yield from _render_rows(self.compile(), 0, rows)
+            return
+
+        executor = ProcessPoolExecutor(max_workers=workers)
         try:
-            return template.substitute(**replacer)
-        except KeyError as e:
-            raise KeyError(f"Invalid template: Missing placeholder '{e.args[0]}'")
-        except ValueError:
-            raise ValueError("Invalid template")
+            pending: deque[Future] = deque()
+            start = 0
+            while batch := list(islice(rows, batch_size)):
+                pending.append(
+                    executor.submit(_render_batch, self.__template, start, batch)
+                )
+                start += len(batch)
+                # Keep a few batches per worker in flight, so that the replacers are read lazily.
+                if len(pending) > 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+
+def _rows(replacers: Union[Iterable[dict], Mapping[str, Sequence]]) -> Iterator[dict]:
+    if not isinstance(replacers, Mapping):
+        return iter(replacers)
+    keys = list(replacers)
+    columns = [replacers[key] for key in keys]
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("Columns must have the same length")
+    return (dict(zip(keys, values)) for values in zip(*columns))
+
+
+def _render_rows(
+    compiled: CompiledTemplate, start: int, rows: Iterable[dict]
+) -> Iterator[PromptResult]:
+    for row, replacer in enumerate(rows, start):
+        try:
+            yield PromptResult(row, compiled.render(replacer), None)
+        except (KeyError, ValueError, TypeError) as e:
+            yield PromptResult(row, None, e)
+
+
+def _render_batch(template: str, start: int, rows: list[dict]) -> list[PromptResult]:
+    return list(_render_rows(CompiledTemplate(template), start, rows))
@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from ..io import read_text
+from .prompt import PromptTemplate
+
+
+class _Entry:
+    __slots__ = ("template", "path", "mtime_ns", "size", "checked")
+
+    def __init__(
+        self, template: PromptTemplate, path: Path, stat: os.stat_result
+    ) -> None:
+        self.template = template
+        self.path = path
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.checked = time.monotonic()
+
+
+class TemplateRegistry:
+    """
+    The TemplateRegistry class keeps the prompt templates of a directory in memory, compiled,
+    and reloads a template only when its file has changed.
+
+    Each template is named after its file without the suffix, e.g. "summary" for "summary.txt".
+    A file is checked for changes by its modification time and size, at most once every
+    `check_interval` seconds, so looking up a template usually does not touch the disk.
+
+    Attributes:
+        directory (Path): The directory of the template files.
+        pattern (str): The glob pattern of the template files.
+        check_interval (Optional[float]): The minimum number of seconds between checks of a file.
+                                          If 0, a file is checked on every lookup. If None, files are never checked.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        pattern: str = "*.txt",
+        check_interval: Optional[float] = 1.0,
+    ) -> None:
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.check_interval = check_interval
+        self._entries: dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self.reload()
+
+    def get(self, name: str) -> PromptTemplate:
+        """
+        Returns a template, reloading it if its file has changed since it was loaded.
+
+        Args:
+            name (str): The name of the template.
+
+        Returns:
+            PromptTemplate: The compiled template.
+
+        Raises:
+            KeyError: If there is no template file of the name.
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            self.reload()
+            entry = self._entries.get(name)
+            if entry is None:
+                raise KeyError(f"Template '{name}' not found in '{self.directory}'")
+            return entry.template
+
+        if (
+            self.check_interval is None
+            or time.monotonic() - entry.checked < self.check_interval
+        ):
+            return entry.template
+        with self._lock:
+            return self._refresh(name, entry).template
+
+    def build_prompt(self, name: str, replacer: dict) -> str:
+        """
+        Builds a prompt string from a template, as `PromptTemplate.build_prompt` does.
+
+        Args:
+            name (str): The name of the template.
+            replacer (dict): The values of the placeholders.
+
+        Returns:
+            str: The prompt string.
+
+        Raises:
+            KeyError: If there is no template file of the name, or replacer does not have enough keys.
+            ValueError: If the template string is invalid and cannot be substituted.
+        """
+        return self.get(name).build_prompt(replacer)
+
+    def reload(self) -> None:
+        """
+        Scans the directory, loading new and changed template files and forgetting removed ones.
+        """
+        with self._lock:
+            paths = {
+                path.stem: path
+                for path in self.directory.glob(self.pattern)
+                if path.is_file()
+            }
+            for name in set(self._entries) - set(paths):
+                del self._entries[name]
+            for name, path in paths.items():
+                entry = self._entries.get(name)
+                if entry is None or entry.path != path:
+                    self._entries[name] = self._load(path)
+                else:
+                    self._refresh(name, entry)
+
+    def names(self) -> list[str]:
+        return sorted(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _refresh(self, name: str, entry: _Entry) -> _Entry:
+        try:
+            stat = entry.path.stat()
+        except FileNotFoundError:
+            # Keep serving the last version; the entry is dropped by the next reload.
+            entry.checked = time.monotonic()
+            return entry
+        if stat.st_mtime_ns != entry.mtime_ns or stat.st_size != entry.size:
+            entry = self._entries[name] = self._load(entry.path)
+        else:
+            entry.checked = time.monotonic()
+        return entry
+
+    @staticmethod
+    def _load(path: Path) -> _Entry:
+        stat = path.stat()
+        template = PromptTemplate(read_text(path))
+        template.compile()
+        return _Entry(template, path, stat)
@@ -1 +1,6 @@
+from .cache import CacheInfo, TokenCache
+from .chunker import SENTENCE_PATTERN, Chunk
+from .plan import ChunkPlan, ChunkView
+from .registry import get_encoding, load_seconds, preload, warm_up
 from .tokenizer import Tokenizer
+from .vocab import TokenTable, token_table
@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import NamedTuple, Optional
+
+
+class CacheInfo(NamedTuple):
+    """
+    The statistics of a TokenCache.
+
+    Attributes:
+        hits (int): The number of lookups that found an entry.
+        misses (int): The number of lookups that did not find an entry.
+        maxsize (int): The maximum number of entries.
+        currsize (int): The current number of entries.
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TokenCache:
+    """
+    The TokenCache class is a thread-safe LRU cache of encoded texts keyed by the hash of their content.
+
+    Attributes:
+        maxsize (int): The maximum number of entries.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        assert maxsize >= 1, "'maxsize' must be positive"
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[int, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, text: str) -> Optional[tuple[int, ...]]:
+        """
+        Returns the tokens cached for a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            Optional[tuple[int, ...]]: The tokens, or None if the text is not cached.
+        """
+        key = self._key(text)
+        with self._lock:
+            tokens = self._entries.get(key)
+            if tokens is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return tokens
+
+    def put(self, text: str, tokens: tuple[int, ...]) -> None:
+        """
+        Caches the tokens of a text, evicting the least recently used entry if the cache is full.
+
+        Args:
+            text (str): The text.
+            tokens (tuple[int, ...]): The tokens of the text.
+        """
+        key = self._key(text)
+        with self._lock:
+            self._entries[key] = tokens
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
@@ -0,0 +1,102 @@
+import re
+from typing import NamedTuple
+
+# The end of a sentence, where tiktoken's pre-tokenizers also split, so that the tokens of a
+# sentence do not change when it is joined with its neighbours and the count of a chunk is the
+# sum of the counts of its sentences:
+# - before the whitespace after ".", "!", "?", "。", "！" or "？";
+# - after the line breaks which follow them, which the pre-tokenizers attach to the punctuation
+#   (runs of up to two, as lookbehinds have a fixed width);
+# - before "。", "！" or "？" directly followed by the next sentence, as in Japanese and Chinese,
+#   where the pre-tokenizers attach the punctuation to the following letters.
+SENTENCE_PATTERN = (
+    r"(?<=[.!?。！？])(?=[^\S\r\n])"
+    r"|(?<=[.!?。！？][\r\n])(?![\r\n])"
+    r"|(?<=[.!?。！？][\r\n]{2})(?![\r\n])"
+    r"|(?<=[^\W_])(?=[。！？]\S)"
+)
+
+
+class Chunk(NamedTuple):
+    """
+    A chunk of a text which fits in a token budget.
+
+    Attributes:
+        text (str): The text of the chunk.
+        n_tokens (int): The number of tokens of the chunk.
+        start (int): The offset of the first character of the chunk in the source text.
+        end (int): The offset just after the last character of the chunk in the source text.
+    """
+
+    text: str
+    n_tokens: int
+    start: int
+    end: int
+
+
+class Unit(NamedTuple):
+    start: int
+    end: int
+    n_tokens: int
+    # Whether the unit starts at a token boundary inside a longer span, rather than at a match of a pattern.
+    cut: bool = False
+
+
+def split_spans(text: str, start: int, end: int, pattern: str) -> list[tuple[int, int]]:
+    """
+    Splits text[start:end] into contiguous spans at the start of each match of a pattern.
+
+    Args:
+        text (str): The source text.
+        start (int): The start offset of the region to split.
+        end (int): The end offset of the region to split.
+        pattern (str): The regex pattern of the boundaries.
+
+    Returns:
+        list[tuple[int, int]]: The (start, end) offsets of the spans, which cover the region.
+    """
+    spans = []
+    for m in re.compile(pattern).finditer(text, start, end):
+        if start < m.start():
+            spans.append((start, m.start()))
+            start = m.start()
+    if start < end or not spans:
+        spans.append((start, end))
+    return spans
+
+
+def pack(units: list[Unit], max_tokens: int, overlap: int = 0) -> list[list[Unit]]:
+    """
+    Packs consecutive units into groups of at most `max_tokens` tokens in a single pass.
+
+    Each group starts with the last units of the previous group whose total is at most `overlap` tokens.
+    A unit which was cut at a token boundary always starts a new group without overlap, since the pieces
+    of a cut may encode to more tokens when they are joined again.
+
+    Args:
+        units (list[Unit]): The units, each of which has at most `max_tokens` tokens.
+        max_tokens (int): The maximum number of tokens of each group.
+        overlap (int, optional): The maximum number of overlapping tokens between groups. Defaults to 0.
+
+    Returns:
+        list[list[Unit]]: The groups of units.
+    """
+    groups: list[list[Unit]] = []
+    group: list[Unit] = []
+    n_tokens = 0
+    for unit in units:
+        if group and (unit.cut or n_tokens + unit.n_tokens > max_tokens):
+            groups.append(group)
+            group, n_tokens = [], 0
+            for prev in reversed(groups[-1]):
+                if unit.cut or n_tokens + prev.n_tokens > overlap:
+                    break
+                group.insert(0, prev)
+                n_tokens += prev.n_tokens
+            while group and n_tokens + unit.n_tokens > max_tokens:
+                n_tokens -= group.pop(0).n_tokens
+        group.append(unit)
+        n_tokens += unit.n_tokens
+    if group:
+        groups.append(group)
+    return groups
@@ -0,0 +1,133 @@
+from array import array
+from typing import Iterator, Optional
+
+import tiktoken
+
+# Continuation bytes of UTF-8 (0b10xxxxxx). Every other byte starts a character.
+_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+
+def count_chars(data: bytes) -> int:
+    """
+    Counts the characters of UTF-8 bytes without decoding them, as the number of bytes which start a character.
+
+    Args:
+        data (bytes): The UTF-8 bytes. They may start or end in the middle of a character.
+
+    Returns:
+        int: The number of characters which start in the bytes.
+    """
+    return len(data.translate(None, _CONTINUATION_BYTES))
+
+
+class ChunkView:
+    """
+    A lightweight view of a chunk of a ChunkPlan. The tokens are not copied and the text is decoded on demand.
+
+    Attributes:
+        start (int): The offset of the first token of the chunk in the plan.
+        end (int): The offset just after the last token of the chunk in the plan.
+        char_start (int): The offset of the first character of the chunk in the source text.
+        char_end (int): The offset just after the last character of the chunk in the source text.
+    """
+
+    __slots__ = ("_plan", "_index", "start", "end")
+
+    def __init__(self, plan: "ChunkPlan", index: int, start: int, end: int) -> None:
+        self._plan = plan
+        self._index = index
+        self.start = start
+        self.end = end
+
+    @property
+    def char_start(self) -> int:
+        return self._plan.char_offsets[self._index]
+
+    @property
+    def char_end(self) -> int:
+        return self._plan.char_offsets[self._index + 1]
+
+    @property
+    def n_tokens(self) -> int:
+        return self.end - self.start
+
+    @property
+    def tokens(self) -> memoryview:
+        """
+        The tokens of the chunk as a read-only view of the token array of the plan.
+        """
+        return memoryview(self._plan.tokens).toreadonly()[self.start : self.end]
+
+    @property
+    def text(self) -> str:
+        """
+        The decoded text of the chunk. A character split between two chunks is replaced with U+FFFD,
+        as in `Tokenizer.divide_text_by_max_token`.
+        """
+        return self._plan.encoding.decode(self.tokens)
+
+    def __repr__(self) -> str:
+        return f"ChunkView(start={self.start}, end={self.end})"
+
+
+class ChunkPlan:
+    """
+    The ChunkPlan class divides the tokens of a text into chunks of at most `max_tokens` tokens without decoding them.
+
+    The tokens are kept once in a compact array, and the chunks are created as ChunkView objects when accessed.
+    The character offsets of the chunks are computed from the byte lengths of their tokens when first accessed,
+    and a character split between two chunks belongs to the chunk where it starts.
+
+    Attributes:
+        encoding (tiktoken.Encoding): The encoding of the tokens.
+        tokens (array): The tokens of the text as an array of unsigned ints.
+        max_tokens (int): The maximum number of tokens of each chunk.
+    """
+
+    def __init__(
+        self, encoding: tiktoken.Encoding, tokens: array, max_tokens: int
+    ) -> None:
+        assert max_tokens >= 1, "'max_tokens' must be positive"
+        self.encoding = encoding
+        self.tokens = tokens
+        self.max_tokens = max_tokens
+        self._char_offsets: Optional[array] = None
+
+    @property
+    def n_tokens(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def n_chars(self) -> int:
+        return self.char_offsets[-1]
+
+    @property
+    def char_offsets(self) -> array:
+        """
+        The character offsets of the boundaries of the chunks in the source text, from 0 to the length of the text.
+        """
+        if self._char_offsets is None:
+            view = memoryview(self.tokens)
+            offsets = array("Q", [0])
+            for start in range(0, len(self.tokens), self.max_tokens):
+                data = self.encoding.decode_bytes(view[start : start + self.max_tokens])
+                offsets.append(offsets[-1] + count_chars(data))
+            self._char_offsets = offsets
+        return self._char_offsets
+
+    def __len__(self) -> int:
+        return -(-len(self.tokens) // self.max_tokens)
+
+    def __getitem__(self, index: int) -> ChunkView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Chunk index out of range")
+        start = index * self.max_tokens
+        return ChunkView(
+            self, index, start, min(start + self.max_tokens, len(self.tokens))
+        )
+
+    def __iter__(self) -> Iterator[ChunkView]:
+        for index in range(len(self)):
+            yield self[index]
@@ -0,0 +1,151 @@
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+import tiktoken
+import tiktoken.load
+import tiktoken.model
+import tiktoken.registry
+
+DEFAULT_ENCODINGS = ["cl100k_base"]
+
+_ENCODINGS: dict[str, tiktoken.Encoding] = {}
+_LOAD_SECONDS: dict[str, float] = {}
+_LOCK = threading.Lock()
+
+
+def get_encoding(name: str) -> tiktoken.Encoding:
+    """
+    Returns the encoding of a model or an encoding name from the process-wide registry.
+
+    The encoding is loaded on the first call for each name, and later calls are a dictionary lookup.
+
+    Args:
+        name (str): A model name such as "gpt-4", or an encoding name such as "cl100k_base".
+
+    Returns:
+        tiktoken.Encoding: The encoding.
+
+    Raises:
+        KeyError: If the name is neither a known model nor a known encoding.
+    """
+    encoding = _ENCODINGS.get(name)
+    if encoding is not None:
+        return encoding
+
+    with _LOCK:
+        if name not in _ENCODINGS:
+            start = time.perf_counter()
+            encoding_name = _encoding_name(name)
+            # A model shares the encoding of its encoding name, which may have been preloaded.
+            encoding = _ENCODINGS.get(encoding_name)
+            if encoding is None:
+                encoding = tiktoken.get_encoding(encoding_name)
+                _ENCODINGS[encoding_name] = encoding
+                _LOAD_SECONDS[encoding_name] = time.perf_counter() - start
+            _ENCODINGS[name] = encoding
+            _LOAD_SECONDS.setdefault(name, time.perf_counter() - start)
+    return _ENCODINGS[name]
+
+
+def warm_up(names: Iterable[str] = DEFAULT_ENCODINGS) -> dict[str, float]:
+    """
+    Loads the encodings of models or encoding names in advance so that creating a Tokenizer costs nothing.
+
+    Args:
+        names (Iterable[str], optional): Model names or encoding names. Defaults to DEFAULT_ENCODINGS.
+
+    Returns:
+        dict[str, float]: The seconds spent loading each encoding. Names which were already loaded take 0.0.
+    """
+    seconds = {}
+    for name in names:
+        loaded = name in _ENCODINGS
+        start = time.perf_counter()
+        get_encoding(name).encode("warm up")
+        seconds[name] = 0.0 if loaded else time.perf_counter() - start
+    return seconds
+
+
+def preload(
+    directory: Path | str,
+    names: Iterable[str] = DEFAULT_ENCODINGS,
+    verify: bool = True,
+) -> dict[str, float]:
+    """
+    Loads encodings from the BPE files in a local directory, so that no network access is needed.
+
+    Each file is named as in tiktoken's download URL, e.g. "cl100k_base.tiktoken" for cl100k_base
+    and "o200k_base.tiktoken" for o200k_base and o200k_harmony. The encoding is built with the pattern
+    and the special tokens of tiktoken's constructor, and replaces the encoding of the name and of its
+    models in the registry.
+
+    Args:
+        directory (Path | str): The directory of the BPE files.
+        names (Iterable[str], optional): Model names or encoding names. Defaults to DEFAULT_ENCODINGS.
+        verify (bool, optional): Whether to check the files against the hashes known to tiktoken. Defaults to True.
+
+    Returns:
+        dict[str, float]: The seconds spent loading each encoding.
+
+    Raises:
+        KeyError: If a name is neither a known model nor a known encoding.
+        FileNotFoundError: If a BPE file is not in the directory.
+        ValueError: If a BPE file does not match its hash and `verify` is True.
+    """
+    directory = Path(directory)
+    seconds = {}
+    for name in names:
+        start = time.perf_counter()
+        encoding_name = _encoding_name(name)
+        with _LOCK:
+            encoding = _load_local(directory, encoding_name, verify)
+            for key in [k for k, v in _ENCODINGS.items() if v.name == encoding_name]:
+                del _ENCODINGS[key]
+            _ENCODINGS[encoding_name] = _ENCODINGS[name] = encoding
+            seconds[name] = _LOAD_SECONDS[encoding_name] = time.perf_counter() - start
+    return seconds
+
+
+def load_seconds() -> dict[str, float]:
+    """
+    Returns the seconds spent loading each encoding in the registry.
+
+    Returns:
+        dict[str, float]: The seconds spent by the first `get_encoding` call of each name.
+    """
+    return dict(_LOAD_SECONDS)
+
+
+def _encoding_name(name: str) -> str:
+    if name in tiktoken.list_encoding_names():
+        return name
+    return tiktoken.model.encoding_name_for_model(name)
+
+
+def _load_local(directory: Path, name: str, verify: bool) -> tiktoken.Encoding:
+    def read_file_cached(blobpath: str, expected_hash: Optional[str] = None) -> bytes:
+        path = directory / blobpath.rsplit("/", 1)[-1]
+        if not path.is_file():
+            raise FileNotFoundError(
+                f"BPE file '{path.name}' of '{name}' not found in '{directory}'"
+            )
+        data = path.read_bytes()
+        if (
+            verify
+            and expected_hash
+            and not tiktoken.load.check_hash(data, expected_hash)
+        ):
+            raise ValueError(f"Hash mismatch for '{path}' (expected {expected_hash})")
+        return data
+
+    # The constructors of tiktoken_ext read their files through tiktoken.load.read_file_cached, which
+    # downloads them. It is replaced while the constructor runs, so that only local files are read.
+    constructor = tiktoken.registry.ENCODING_CONSTRUCTORS[name]  # type: ignore[index]
+    download = tiktoken.load.read_file_cached
+    tiktoken.load.read_file_cached = read_file_cached
+    try:
+        return tiktoken.Encoding(**constructor())
+    finally:
+        tiktoken.load.read_file_cached = download
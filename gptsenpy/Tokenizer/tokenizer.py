@@ -1,32 +1,94 @@
-import tiktoken
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, Sequence
+
+from .cache import CacheInfo, TokenCache
+from .chunker import SENTENCE_PATTERN, Chunk, Unit, pack, split_spans
+from .plan import ChunkPlan
+from .registry import get_encoding
+from .vocab import token_table
+
+# A letter followed by a space, "。" or "、" and another letter. tiktoken's pre-tokenizers never merge
+# the letter with what follows, so encoding the text on each side of the boundary separately gives
+# the same tokens as encoding the whole text.
+_SAFE_BOUNDARY = re.compile(r"(?<=[^\W\d_])(?=[ 。、][^\W\d_])")
 
 
 class Tokenizer:
-    def __init__(self, model: str) -> None:
+    def __init__(self, model: str, cache_size: int = 0) -> None:
+        """
+        Args:
+            model: str, a model name such as "gpt-4".
+            cache_size: int, the maximum number of texts whose tokens are memoized. 0 disables the cache.
+        """
         self.model = model
-        self.tokenizer = tiktoken.encoding_for_model(model)
+        self.tokenizer = get_encoding(model)
+        self.table = token_table(self.tokenizer)
+        self.cache: Optional[TokenCache] = (
+            TokenCache(cache_size) if cache_size > 0 else None
+        )
 
-    def tokenize(self, text: str) -> list[str]:
+    def tokenize(self, text: str, errors: str = "replace") -> list[str]:
         """
         Tokenize a text into a list of tokens.
 
         Args:
             text: str
+            errors: str, the error handler of `bytes.decode` for tokens which are parts of a multibyte
+                    character, such as "replace", "ignore" or "strict". Defaults to "replace".
 
         Returns:
             List[str]
 
         Raises:
             ValueError: If input text is not string.
+            UnicodeDecodeError: If a token is a part of a multibyte character and `errors` is "strict".
         """
         if not isinstance(text, str):
             raise ValueError("Input must be a string")
-        list_tokens: list[int] = self._encode(text)
-        _tokens: list = [
-            self.tokenizer.decode_single_token_bytes(token) for token in list_tokens
-        ]
-        tokens: list = [token.decode("utf-8") for token in _tokens]
-        return tokens
+        return self.table.strings(self._encode(text), errors)
+
+    def tokenize_bytes(self, text: str) -> list[bytes]:
+        """
+        Tokenize a text into a list of the bytes of the tokens, which never fails on multibyte characters.
+
+        Args:
+            text: str
+
+        Returns:
+            List[bytes]
+
+        Raises:
+            ValueError: If input text is not string.
+        """
+        if not isinstance(text, str):
+            raise ValueError("Input must be a string")
+        return self.table.bytes(self._encode(text))
+
+    def tokenize_with_offsets(
+        self, text: str, errors: str = "replace"
+    ) -> tuple[list[str], list[int]]:
+        """
+        Tokenize a text into a list of tokens and the offsets of their first characters in the text.
+
+        Args:
+            text: str
+            errors: str, the error handler for tokens which are parts of a multibyte character,
+                    as in `tokenize`. Defaults to "replace".
+
+        Returns:
+            tuple[List[str], List[int]]: The tokens and their offsets. A token which starts in the
+                                         middle of a character takes the offset of that character.
+
+        Raises:
+            ValueError: If input text is not string.
+        """
+        if not isinstance(text, str):
+            raise ValueError("Input must be a string")
+        tokens = self._encode(text)
+        return self.table.strings(tokens, errors), self.table.offsets(tokens)
 
     def count_tokens(self, text: str) -> int:
         """
@@ -43,9 +105,97 @@ class Tokenizer:
         """
         if not isinstance(text, str):
             raise ValueError("Input must be a string")
-        tokens = self._encode(text)
+        tokens = self._tokens(text)
         return len(tokens)
 
+    def count_tokens_iter(
+        self, texts: Iterable[str], buffer_size: int = 1 << 16
+    ) -> int:
+        """
+        Count tokens of the concatenation of texts from an iterable without holding the whole text in memory.
+
+        The texts, such as the pages of `PDFLoader.iter_pages` or the lines of a file, are buffered and
+        encoded up to the last safe boundary each time the buffer reaches `buffer_size` characters,
+        so the count is the same as `count_tokens("".join(texts))`. The buffer only grows beyond
+        `buffer_size` while it has no safe boundary, i.e. a letter followed by a space, "。" or "、"
+        and another letter.
+
+        Args:
+            texts (Iterable[str]): The pieces of the text.
+            buffer_size (int, optional): The number of characters buffered before encoding. Defaults to 65536.
+
+        Returns:
+            int: The number of tokens of the concatenated text.
+
+        Raises:
+            ValueError: If an input text is not string.
+        """
+        n_tokens = 0
+        buffer = ""
+        limit = buffer_size
+        for text in texts:
+            if not isinstance(text, str):
+                raise ValueError("Input must be a string")
+            buffer += text
+            if len(buffer) < limit:
+                continue
+            cut = 0
+            # Boundaries before the last scan were not found, except for the last two characters.
+            for m in _SAFE_BOUNDARY.finditer(buffer, max(1, limit - buffer_size - 2)):
+                cut = m.start()
+            if cut:
+                n_tokens += len(self.tokenizer.encode(buffer[:cut]))
+                buffer = buffer[cut:]
+                limit = buffer_size
+            else:
+                limit = len(buffer) + buffer_size
+        return n_tokens + len(self.tokenizer.encode(buffer))
+
+    def encode_batch(self, texts: list[str], num_threads: int = 8) -> list[list[int]]:
+        """
+        Encode a list of texts into token ids using multiple threads.
+
+        Args:
+            texts: list[str]
+            num_threads: int, the number of threads. Defaults to 8.
+
+        Returns:
+            list[list[int]]
+
+        Raises:
+            ValueError: If an input text is not string.
+        """
+        if not all(isinstance(text, str) for text in texts):
+            raise ValueError("Input must be a list of strings")
+        if num_threads <= 1 or len(texts) <= 1:
+            return self._encode_group(texts)
+        # tiktoken's encode_batch submits one task per text, whose overhead dominates for
+        # short prompts, so each thread encodes a contiguous group of texts instead.
+        size = -(-len(texts) // num_threads)
+        groups = [texts[i : i + size] for i in range(0, len(texts), size)]
+        with ThreadPoolExecutor(num_threads) as executor:
+            return [
+                tokens
+                for group in executor.map(self._encode_group, groups)
+                for tokens in group
+            ]
+
+    def count_tokens_batch(self, texts: list[str], num_threads: int = 8) -> list[int]:
+        """
+        Count tokens of each text in a list using multiple threads.
+
+        Args:
+            texts: list[str]
+            num_threads: int, the number of threads. Defaults to 8.
+
+        Returns:
+            list[int]
+
+        Raises:
+            ValueError: If an input text is not string.
+        """
+        return [len(tokens) for tokens in self.encode_batch(texts, num_threads)]
+
     def divide_text_by_max_token(self, text: str, max_tokens: int = 4000) -> list[str]:
         """
         This function divides a given text into smaller chunks based on a maximum number of tokens.
@@ -68,8 +218,213 @@ class Tokenizer:
         divided_texts = [self._decode(token) for token in divided_tokens]
         return divided_texts
 
+    def plan_chunks(self, text: str, max_tokens: int = 4000) -> ChunkPlan:
+        """
+        Plans the division of a text into chunks of at most `max_tokens` tokens, as `divide_text_by_max_token`
+        does, without decoding the chunks.
+
+        The text is encoded once and its tokens are kept in a compact array. Each chunk of the plan is a view
+        with its token and character offsets, and its text is decoded only when accessed.
+
+        Args:
+            text (str): The input text to be divided.
+            max_tokens (int, optional): The maximum number of tokens for each chunk. Defaults to 4000.
+
+        Returns:
+            ChunkPlan: The chunks of the text.
+
+        Raises:
+            ValueError: If input text is not string.
+        """
+        if not isinstance(text, str):
+            raise ValueError("Input must be a string")
+        return ChunkPlan(self.tokenizer, array("I", self._tokens(text)), max_tokens)
+
+    def divide_text_by_boundary(
+        self,
+        text: str,
+        max_tokens: int = 4000,
+        overlap: int = 0,
+        patterns: Sequence[str] = (SENTENCE_PATTERN,),
+    ) -> list[Chunk]:
+        """
+        This function divides a given text into chunks of at most `max_tokens` tokens without cutting
+        sentences, or any other units given by `patterns`, in the middle.
+
+        The text is split at the matches of the first pattern, and units with more than `max_tokens`
+        tokens are split by the next pattern, then at token boundaries as a last resort. Each unit is
+        encoded once, and consecutive units are packed into chunks in a single pass. To keep sections
+        together, pass e.g. `patterns=(SECTION_PATTERN, SENTENCE_PATTERN)` with `gptsenpy.PDFLoader.SECTION_PATTERN`.
+
+        Args:
+            text (str): The input text to be divided.
+            max_tokens (int, optional): The maximum number of tokens for each chunk. Defaults to 4000.
+            overlap (int, optional): The maximum number of tokens of the trailing units of a chunk
+                                     which are repeated at the start of the next chunk. Defaults to 0.
+            patterns (Sequence[str], optional): The regex patterns of the unit boundaries, from the
+                                                coarsest to the finest. Defaults to (SENTENCE_PATTERN,).
+
+        Returns:
+            list[Chunk]: The chunks with their token counts and character offsets in `text`.
+                         The token count of a chunk is the sum of the counts of its units, which is exact
+                         when the boundaries of `patterns` are also boundaries of tiktoken's pre-tokenizer,
+                         as those of SENTENCE_PATTERN are. The pieces of a unit which is split at token
+                         boundaries are never joined again.
+        """
+        assert 0 <= overlap < max_tokens, "'overlap' must be smaller than 'max_tokens'"
+        if not text:
+            return []
+        units = self._units(text, 0, len(text), patterns, max_tokens)
+        return [
+            Chunk(
+                text[group[0].start : group[-1].end],
+                sum(unit.n_tokens for unit in group),
+                group[0].start,
+                group[-1].end,
+            )
+            for group in pack(units, max_tokens, overlap)
+        ]
+
+    def divide_batch(
+        self, texts: list[str], max_tokens: int = 4000, num_threads: int = 8
+    ) -> list[list[str]]:
+        """
+        Divides each text in a list into chunks of at most `max_tokens` tokens using multiple threads.
+
+        Args:
+            texts (list[str]): The input texts to be divided.
+            max_tokens (int, optional): The maximum number of tokens for each divided text.
+                                         Defaults to 4000.
+            num_threads (int, optional): The number of threads. Defaults to 8.
+
+        Returns:
+            list[list[str]]: The divided texts of each input text, as returned by `divide_text_by_max_token`.
+        """
+        divided_tokens = []
+        n_chunks = []
+        for tokens in self.encode_batch(texts, num_threads):
+            chunks = [
+                tokens[i : i + max_tokens] for i in range(0, len(tokens), max_tokens)
+            ]
+            divided_tokens.extend(chunks)
+            n_chunks.append(len(chunks))
+        divided_texts = self.tokenizer.decode_batch(
+            divided_tokens, num_threads=num_threads
+        )
+        ret = []
+        start = 0
+        for n in n_chunks:
+            ret.append(divided_texts[start : start + n])
+            start += n
+        return ret
+
+    def iter_divide_text_by_max_token(
+        self, texts: Iterable[str], max_tokens: int = 4000
+    ) -> Iterator[str]:
+        """
+        Divides each text of an iterable into chunks of at most `max_tokens` tokens and yields them one by one.
+
+        This is the streaming counterpart of `divide_text_by_max_token`, e.g. for the pages of
+        `PDFLoader.iter_pages` or the sections of `PDFLoader.iter_sections`. Only one text is
+        encoded at a time.
+
+        Args:
+            texts (Iterable[str]): The input texts to be divided.
+            max_tokens (int, optional): The maximum number of tokens for each divided text.
+                                         Defaults to 4000.
+
+        Yields:
+            str: Each divided text, which contains no more than `max_tokens` tokens.
+        """
+        for text in texts:
+            yield from self.divide_text_by_max_token(text, max_tokens)
+
+    def cache_info(self) -> Optional[CacheInfo]:
+        """
+        Returns the statistics of the token cache.
+
+        Returns:
+            Optional[CacheInfo]: The hits, misses and sizes of the cache, or None if the cache is disabled.
+        """
+        return None if self.cache is None else self.cache.info()
+
+    def cache_clear(self) -> None:
+        if self.cache is not None:
+            self.cache.clear()
+
+    def _units(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        patterns: Sequence[str],
+        max_tokens: int,
+    ) -> list[Unit]:
+        spans = (
+            split_spans(text, start, end, patterns[0]) if patterns else [(start, end)]
+        )
+        units = []
+        for span_start, span_end in spans:
+            tokens = self._tokens(text[span_start:span_end])
+            if len(tokens) <= max_tokens:
+                units.append(Unit(span_start, span_end, len(tokens)))
+            elif len(patterns) > 1:
+                units.extend(
+                    self._units(text, span_start, span_end, patterns[1:], max_tokens)
+                )
+            else:
+                units.extend(
+                    self._split_units(text, span_start, span_end, tokens, max_tokens)
+                )
+        return units
+
+    def _split_units(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        tokens: Sequence[int],
+        max_tokens: int,
+    ) -> Iterator[Unit]:
+        # A cut at a token boundary moves a character whose bytes span two tokens into the next
+        # unit, and may change how the word around it is encoded, so each unit is encoded again
+        # and shrunk by one token at a time until it fits.
+        _, offsets = self.tokenizer.decode_with_offsets(list(tokens))
+        bounds = [start + offset for offset in offsets] + [end]
+        i = 0
+        while bounds[i] < end:
+            j = min(i + max_tokens, len(tokens))
+            if bounds[j] == bounds[i]:
+                j = bisect_right(bounds, bounds[i])
+            n_tokens = len(self.tokenizer.encode(text[bounds[i] : bounds[j]]))
+            while n_tokens > max_tokens:
+                k = bisect_left(bounds, bounds[j]) - 1
+                if bounds[k] == bounds[i]:
+                    # A single character has more than `max_tokens` tokens.
+                    break
+                j = k
+                n_tokens = len(self.tokenizer.encode(text[bounds[i] : bounds[j]]))
+            yield Unit(bounds[i], bounds[j], n_tokens, i > 0)
+            i = bisect_left(bounds, bounds[j])
+
     def _encode(self, text: str) -> list[int]:
-        return self.tokenizer.encode(text)
+        return (
+            list(self._tokens(text))
+            if self.cache is not None
+            else self.tokenizer.encode(text)
+        )
+
+    def _tokens(self, text: str) -> Sequence[int]:
+        if self.cache is None:
+            return self.tokenizer.encode(text)
+        tokens = self.cache.get(text)
+        if tokens is None:
+            tokens = tuple(self.tokenizer.encode(text))
+            self.cache.put(text, tokens)
+        return tokens
+
+    def _encode_group(self, texts: list[str]) -> list[list[int]]:
+        return [self._encode(text) for text in texts]
 
     def _decode(self, token: list[int]) -> str:
         return self.tokenizer.decode(token)
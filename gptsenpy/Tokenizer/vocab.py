@@ -0,0 +1,120 @@
+import threading
+from itertools import accumulate
+from operator import sub
+
+import tiktoken
+
+from .plan import count_chars
+
+
+class TokenTable:
+    """
+    The TokenTable class is a table of the bytes and strings of the tokens of an encoding, which is filled lazily.
+
+    Each token is looked up in the encoding once, so that a text is decoded token by token with dictionary
+    lookups only. Tokens whose bytes are not valid UTF-8 by themselves, i.e. parts of a multibyte character,
+    are kept as bytes and decoded with the requested error handler on each call.
+
+    Attributes:
+        encoding (tiktoken.Encoding): The encoding of the tokens.
+    """
+
+    def __init__(self, encoding: tiktoken.Encoding) -> None:
+        self.encoding = encoding
+        self._bytes: dict[int, bytes] = {}
+        self._strs: dict[int, str] = {}
+        self._partial: dict[int, bytes] = {}
+        self._n_chars: dict[int, int] = {}
+        self._continued: dict[int, int] = {}
+
+    def bytes(self, tokens: list[int]) -> list[bytes]:
+        """
+        Returns the bytes of each token.
+
+        Args:
+            tokens (list[int]): The tokens.
+
+        Returns:
+            list[bytes]: The bytes of each token.
+        """
+        self._fill(tokens)
+        return list(map(self._bytes.__getitem__, tokens))
+
+    def strings(self, tokens: list[int], errors: str = "replace") -> list[str]:
+        """
+        Returns the string of each token.
+
+        Args:
+            tokens (list[int]): The tokens.
+            errors (str, optional): The error handler of `bytes.decode` for the tokens which are parts of
+                                    a multibyte character. Defaults to "replace".
+
+        Returns:
+            list[str]: The string of each token.
+
+        Raises:
+            UnicodeDecodeError: If a token is a part of a multibyte character and `errors` is "strict".
+        """
+        if not self._fill(tokens):
+            return list(map(self._strs.__getitem__, tokens))
+        strs, partial = self._strs, self._partial
+        return [
+            strs[token] if token in strs else partial[token].decode("utf-8", errors)
+            for token in tokens
+        ]
+
+    def offsets(self, tokens: list[int]) -> list[int]:
+        """
+        Returns the offset of the first character of each token in the decoded text, as `decode_with_offsets` does.
+
+        Args:
+            tokens (list[int]): The tokens.
+
+        Returns:
+            list[int]: The offset of each token. A token which starts in the middle of a character takes the offset
+                       of that character.
+        """
+        self._fill(tokens)
+        starts = accumulate(map(self._n_chars.__getitem__, tokens), initial=0)
+        offsets = list(map(sub, starts, map(self._continued.__getitem__, tokens)))
+        return [max(0, offset) for offset in offsets] if -1 in offsets else offsets
+
+    def _fill(self, tokens: list[int]) -> bool:
+        """
+        Looks up the tokens which are not in the table yet.
+
+        Returns:
+            bool: Whether any of the tokens is a part of a multibyte character.
+        """
+        unique = set(tokens)
+        for token in unique.difference(self._bytes):
+            data = self.encoding.decode_single_token_bytes(token)
+            try:
+                self._strs[token] = data.decode("utf-8")
+            except UnicodeDecodeError:
+                self._partial[token] = data
+            self._n_chars[token] = count_chars(data)
+            self._continued[token] = int(bool(data) and 0x80 <= data[0] < 0xC0)
+            self._bytes[token] = data
+        return bool(self._partial) and not unique.isdisjoint(self._partial)
+
+
+_TABLES: dict[str, TokenTable] = {}
+_LOCK = threading.Lock()
+
+
+def token_table(encoding: tiktoken.Encoding) -> TokenTable:
+    """
+    Returns the process-wide TokenTable of an encoding.
+
+    Args:
+        encoding (tiktoken.Encoding): The encoding.
+
+    Returns:
+        TokenTable: The table of the tokens of the encoding.
+    """
+    table = _TABLES.get(encoding.name)
+    if table is None:
+        with _LOCK:
+            table = _TABLES.setdefault(encoding.name, TokenTable(encoding))
+    return table
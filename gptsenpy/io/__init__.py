@@ -1 +1,18 @@
-from .read import check_duplicate_keys, read_json, read_text
+from .aio import aread_json, aread_text, gather_json, gather_text, io_executor
+from .jsonl import (
+    JsonlWriter,
+    build_index,
+    index_path,
+    iter_jsonl,
+    read_index,
+    write_jsonl,
+)
+from .read import (
+    JSON_BACKENDS,
+    check_duplicate_keys,
+    iter_text,
+    json_backend,
+    read_json,
+    read_json_dir,
+    read_text,
+)
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Optional, TypeVar
+
+from .read import read_json, read_text
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 8
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_LOCK = threading.Lock()
+
+
+def io_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool shared by the async readers, which is created on the first call.
+
+    Returns:
+        ThreadPoolExecutor: The executor with DEFAULT_MAX_WORKERS threads.
+    """
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="gptsenpy-io"
+            )
+        return _EXECUTOR
+
+
+async def aread_json(
+    path: Path | str,
+    check_duplicates: bool = True,
+    backend: Optional[str] = None,
+    executor: Optional[Executor] = None,
+) -> Any:
+    """
+    Reads a JSON file in an executor without blocking the event loop, as `read_json` does.
+
+    Args:
+        path (Path | str): The path of the JSON file.
+        check_duplicates (bool, optional): Whether to check duplicate keys. Defaults to True.
+        backend (Optional[str], optional): The JSON parser, as in `read_json`. Defaults to None.
+        executor (Optional[Executor], optional): The executor of the read. Defaults to `io_executor()`.
+
+    Returns:
+        Any: The parsed JSON data.
+
+    Raises:
+        AssertionError: If an object has duplicate keys and `check_duplicates` is True.
+    """
+    return await _run(executor, partial(read_json, path, check_duplicates, backend))
+
+
+async def aread_text(path: Path | str, executor: Optional[Executor] = None) -> str:
+    """
+    Reads a text file in an executor without blocking the event loop, as `read_text` does.
+
+    Args:
+        path (Path | str): The path of the text file.
+        executor (Optional[Executor], optional): The executor of the read. Defaults to `io_executor()`.
+
+    Returns:
+        str: The text without trailing whitespace.
+    """
+    return await _run(executor, partial(read_text, path))
+
+
+async def gather_json(
+    paths: Iterable[Path | str],
+    limit: int = DEFAULT_MAX_WORKERS,
+    return_exceptions: bool = False,
+    check_duplicates: bool = True,
+    backend: Optional[str] = None,
+    executor: Optional[Executor] = None,
+) -> list[Any]:
+    """
+    Reads many JSON files concurrently, with at most `limit` files read at a time.
+
+    Args:
+        paths (Iterable[Path | str]): The paths of the JSON files.
+        limit (int, optional): The maximum number of concurrent reads. Defaults to DEFAULT_MAX_WORKERS.
+        return_exceptions (bool, optional): Whether to return the error of a file which cannot be read in place
+                                            of its data instead of raising it, as in `asyncio.gather`.
+                                            Defaults to False.
+        check_duplicates (bool, optional): Whether to check duplicate keys. Defaults to True.
+        backend (Optional[str], optional): The JSON parser, as in `read_json`. Defaults to None.
+        executor (Optional[Executor], optional): The executor of the reads. Defaults to `io_executor()`.
+
+    Returns:
+        list[Any]: The parsed data of each file in the order of `paths`.
+    """
+    return await _gather(
+        [
+            partial(aread_json, path, check_duplicates, backend, executor)
+            for path in paths
+        ],
+        limit,
+        return_exceptions,
+    )
+
+
+async def gather_text(
+    paths: Iterable[Path | str],
+    limit: int = DEFAULT_MAX_WORKERS,
+    return_exceptions: bool = False,
+    executor: Optional[Executor] = None,
+) -> list[Any]:
+    """
+    Reads many text files concurrently, with at most `limit` files read at a time.
+
+    Args:
+        paths (Iterable[Path | str]): The paths of the text files.
+        limit (int, optional): The maximum number of concurrent reads. Defaults to DEFAULT_MAX_WORKERS.
+        return_exceptions (bool, optional): Whether to return the error of a file which cannot be read in place
+                                            of its text instead of raising it, as in `asyncio.gather`.
+                                            Defaults to False.
+        executor (Optional[Executor], optional): The executor of the reads. Defaults to `io_executor()`.
+
+    Returns:
+        list[Any]: The text of each file in the order of `paths`.
+    """
+    return await _gather(
+        [partial(aread_text, path, executor) for path in paths],
+        limit,
+        return_exceptions,
+    )
+
+
+async def _run(executor: Optional[Executor], func: Callable[[], T]) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or io_executor(), func)
+
+
+async def _gather(
+    reads: list[Callable[[], Awaitable[Any]]], limit: int, return_exceptions: bool
+) -> list[Any]:
+    assert limit >= 1, "'limit' must be positive"
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(read: Callable[[], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            return await read()
+
+    return await asyncio.gather(
+        *(bounded(read) for read in reads), return_exceptions=return_exceptions
+    )
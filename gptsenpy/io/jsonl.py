@@ -0,0 +1,240 @@
+import gzip
+import io
+import json
+import os
+from array import array
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Optional
+
+from .read import _loads, json_backend, orjson
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
+INDEX_SUFFIX = ".idx"
+
+
+def index_path(path: Path | str) -> Path:
+    """
+    Returns the path of the sidecar index of a JSON Lines file, e.g. "results.jsonl.gz.idx".
+
+    Args:
+        path (Path | str): The path of the JSON Lines file.
+
+    Returns:
+        Path: The path of the index.
+    """
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+class JsonlWriter:
+    """
+    The JsonlWriter class writes records to a JSON Lines file one at a time.
+
+    The file is compressed with gzip if its name ends with ".gz", or with zstd if it ends with ".zst" or ".zstd".
+    If `index` is True, the offset of each record in the uncompressed stream is written to a sidecar index,
+    so that `iter_jsonl` can seek to a record without parsing the ones before it.
+
+    Attributes:
+        path (Path): The path of the JSON Lines file.
+        n_records (int): The number of records in the file, if it is indexed, or written by this writer otherwise.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        append: bool = False,
+        index: bool = False,
+        backend: Optional[str] = None,
+    ) -> None:
+        self.path = Path(path)
+        self._backend = "json" if backend is None else json_backend(backend)
+        self._offsets: Optional[array] = None
+        if index:
+            if append and self.path.exists():
+                self._offsets = read_index(self.path) or build_index(self.path)
+            else:
+                self._offsets = array("Q", [0])
+        self.n_records = len(self._offsets) - 1 if self._offsets is not None else 0
+        self._offset = self._offsets[-1] if self._offsets is not None else 0
+        self._file = _open(self.path, "ab" if append else "wb")
+
+    def write(self, record: Any) -> None:
+        """
+        Writes a record as a line of JSON.
+
+        Args:
+            record (Any): The JSON-serializable record.
+        """
+        if self._backend == "orjson":
+            line = orjson.dumps(record) + b"\n"
+        else:
+            line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+        self._file.write(line)
+        self._offset += len(line)
+        self.n_records += 1
+        if self._offsets is not None:
+            self._offsets.append(self._offset)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.close()
+        if self._offsets is not None:
+            _write_index(self.path, self._offsets)
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def write_jsonl(
+    path: Path | str,
+    records: Iterable[Any],
+    append: bool = False,
+    index: bool = False,
+    backend: Optional[str] = None,
+) -> int:
+    """
+    Writes records to a JSON Lines file, one record per line.
+
+    Args:
+        path (Path | str): The path of the JSON Lines file, compressed if it ends with ".gz", ".zst" or ".zstd".
+        records (Iterable[Any]): The JSON-serializable records, which are consumed lazily.
+        append (bool, optional): Whether to append the records to the file. Defaults to False.
+        index (bool, optional): Whether to keep a sidecar index of the record offsets. Defaults to False.
+        backend (Optional[str], optional): The JSON serializer, "json" or "orjson". Defaults to "json".
+
+    Returns:
+        int: The number of records written.
+    """
+    n_written = 0
+    with JsonlWriter(path, append, index, backend) as writer:
+        for record in records:
+            writer.write(record)
+            n_written += 1
+    return n_written
+
+
+def iter_jsonl(
+    path: Path | str,
+    start: int = 0,
+    check_duplicates: bool = True,
+    backend: Optional[str] = None,
+) -> Iterator[Any]:
+    """
+    Reads the records of a JSON Lines file one at a time, holding only one line in memory.
+
+    Args:
+        path (Path | str): The path of the JSON Lines file, compressed if it ends with ".gz", ".zst" or ".zstd".
+        start (int, optional): The index of the first record to read. If the file has an up-to-date sidecar index,
+                               the reader seeks to the record without parsing the ones before it. Defaults to 0.
+        check_duplicates (bool, optional): Whether to check duplicate keys, as in `read_json`. Defaults to True.
+        backend (Optional[str], optional): The JSON parser, as in `read_json`. Defaults to None.
+
+    Yields:
+        Any: Each record.
+
+    Raises:
+        AssertionError: If a record has duplicate keys and `check_duplicates` is True.
+    """
+    offsets = read_index(path) if start > 0 else None
+    with _open(Path(path), "rb") as f:
+        lines: Iterator[bytes] = iter(f)
+        if offsets is not None:
+            _seek(f, offsets[min(start, len(offsets) - 1)])
+        elif start > 0:
+            lines = islice((line for line in lines if line.strip()), start, None)
+        for line in lines:
+            if line.strip():
+                yield _loads(line, check_duplicates, backend)
+
+
+def read_index(path: Path | str) -> Optional[array]:
+    """
+    Reads the sidecar index of a JSON Lines file.
+
+    Args:
+        path (Path | str): The path of the JSON Lines file.
+
+    Returns:
+        Optional[array]: The offsets of the records in the uncompressed stream followed by its length,
+                         or None if there is no index or the file has been modified since it was written.
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+        data = index_path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+    index = array("Q")
+    index.frombytes(data[: len(data) // index.itemsize * index.itemsize])
+    # The index starts with the size and the modification time of the file it was built for.
+    if len(index) < 3 or index[:2] != array("Q", [stat.st_size, stat.st_mtime_ns]):
+        return None
+    return index[2:]
+
+
+def build_index(path: Path | str) -> array:
+    """
+    Scans a JSON Lines file and writes its sidecar index.
+
+    Args:
+        path (Path | str): The path of the JSON Lines file.
+
+    Returns:
+        array: The offsets of the records in the uncompressed stream followed by its length.
+    """
+    offsets = array("Q")
+    offset = 0
+    with _open(Path(path), "rb") as f:
+        for line in f:
+            if line.strip():
+                offsets.append(offset)
+            offset += len(line)
+    offsets.append(offset)
+    _write_index(Path(path), offsets)
+    return offsets
+
+
+def _write_index(path: Path, offsets: array) -> None:
+    stat = path.stat()
+    idx_path = index_path(path)
+    tmp_path = idx_path.with_name(idx_path.name + ".tmp")
+    tmp_path.write_bytes(
+        array("Q", [stat.st_size, stat.st_mtime_ns]).tobytes() + offsets.tobytes()
+    )
+    os.replace(tmp_path, idx_path)
+
+
+def _open(path: Path, mode: str) -> IO[bytes]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode)  # type: ignore[return-value]
+    if path.suffix in (".zst", ".zstd"):
+        if zstandard is None:
+            raise ImportError("zstandard is required to read and write '.zst' files.")
+        if "r" in mode:
+            # Appending to a file adds a frame, so the reader must read across frames.
+            reader = zstandard.ZstdDecompressor().stream_reader(
+                open(path, "rb"), read_across_frames=True, closefd=True
+            )
+            return io.BufferedReader(reader)  # type: ignore[arg-type]
+        return zstandard.open(path, mode)
+    return open(path, mode)
+
+
+def _seek(f: IO[bytes], offset: int) -> None:
+    if f.seekable():
+        f.seek(offset)
+        return
+    while offset > 0:
+        skipped = len(f.read(min(offset, 1 << 20)))
+        if not skipped:
+            break
+        offset -= skipped
@@ -1,7 +1,25 @@
 import json
 import os
 import sys
+import warnings
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from pathlib import Path
+from typing import Any, Iterator, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None  # type: ignore[assignment]
+
+JSON_BACKENDS = ["json", "orjson", "simdjson"]
 
 
 def check_duplicate_keys(pairs):
@@ -11,14 +29,173 @@ def check_duplicate_keys(pairs):
     Returns:
         dict
     """
-    assert len(pairs) == len(set([k for k, _ in pairs])), "Duplicate keys in JSON file."
-    return dict(pairs)
+    data = dict(pairs)
+    assert len(data) == len(pairs), "Duplicate keys in JSON file."
+    return data
 
 
-def read_json(path: Path | str) -> dict:
-    with open(path, "r") as f:
-        data = json.load(f, object_pairs_hook=check_duplicate_keys)
-    return data
+def json_backend(backend: Optional[str] = None) -> str:
+    """
+    Returns the JSON parser used by `read_json` when duplicate keys are not checked.
+
+    Args:
+        backend (Optional[str], optional): "json", "orjson" or "simdjson". If None, the fastest installed one
+                                           is used, in the order orjson, simdjson and json. Defaults to None.
+
+    Returns:
+        str: The name of the backend.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the backend is not installed.
+    """
+    if backend is None:
+        if orjson is not None:
+            return "orjson"
+        if simdjson is not None:
+            return "simdjson"
+        return "json"
+    if backend not in JSON_BACKENDS:
+        raise ValueError(
+            f"Unknown JSON backend '{backend}'. Choose from {JSON_BACKENDS}."
+        )
+    if (
+        backend == "orjson"
+        and orjson is None
+        or backend == "simdjson"
+        and simdjson is None
+    ):
+        raise ImportError(f"JSON backend '{backend}' is not installed.")
+    return backend
+
+
+def read_json(
+    path: Path | str, check_duplicates: bool = True, backend: Optional[str] = None
+) -> dict:
+    """
+    Reads a JSON file.
+
+    Args:
+        path (Path | str): The path of the JSON file.
+        check_duplicates (bool, optional): Whether to raise on duplicate keys in an object. The check needs
+                                           the standard json parser. Defaults to True.
+        backend (Optional[str], optional): The parser used when duplicate keys are not checked,
+                                           as in `json_backend`. Defaults to None.
+
+    Returns:
+        dict: The parsed JSON data.
+
+    Raises:
+        AssertionError: If an object has duplicate keys and `check_duplicates` is True.
+    """
+    if check_duplicates:
+        with open(path, "r") as f:
+            return json.load(f, object_pairs_hook=check_duplicate_keys)
+
+    with open(path, "rb") as f:
+        return _loads(f.read(), check_duplicates, backend)
+
+
+def _loads(data: str | bytes, check_duplicates: bool, backend: Optional[str]) -> Any:
+    if check_duplicates:
+        return json.loads(data, object_pairs_hook=check_duplicate_keys)
+    backend = json_backend(backend)
+    if backend == "orjson":
+        return orjson.loads(data)
+    if backend == "simdjson":
+        return simdjson.loads(data)
+    return json.loads(data)
+
+
+def read_json_dir(
+    directory: Path | str,
+    pattern: str = "*.json",
+    workers: int = 8,
+    processes: bool = False,
+    errors: Optional[dict[Path, Exception]] = None,
+    check_duplicates: bool = True,
+    backend: Optional[str] = None,
+    batch_size: int = 64,
+) -> Iterator[tuple[Path, Any]]:
+    """
+    Reads the JSON files of a directory concurrently and yields them lazily in the order of their paths.
+
+    Files which cannot be read, e.g. because of duplicate keys or invalid JSON, are skipped and reported
+    in `errors` instead of stopping the iteration.
+
+    Args:
+        directory (Path | str): The directory of the JSON files.
+        pattern (str, optional): The glob pattern of the JSON files. Defaults to "*.json".
+        workers (int, optional): The number of worker threads or processes. If 1, files are read in this thread.
+                                 Defaults to 8.
+        processes (bool, optional): Whether to parse the files in worker processes instead of threads,
+                                    which pays off when parsing dominates reading. Defaults to False.
+        errors (Optional[dict[Path, Exception]], optional): The dictionary where the error of each file which
+            could not be read is stored. If None, a warning is issued for each of them. Defaults to None.
+        check_duplicates (bool, optional): Whether to check duplicate keys, as in `read_json`. Defaults to True.
+        backend (Optional[str], optional): The JSON parser, as in `read_json`. Defaults to None.
+        batch_size (int, optional): The number of files read by a worker at once. Defaults to 64.
+
+    Yields:
+        tuple[Path, Any]: The path and the parsed data of each file which was read.
+    """
+    paths = sorted(path for path in Path(directory).glob(pattern) if path.is_file())
+    batches = (paths[i : i + batch_size] for i in range(0, len(paths), batch_size))
+    read = partial(_read_json_batch, check_duplicates=check_duplicates, backend=backend)
+
+    if workers <= 1:
+        results: Iterator[list] = map(read, batches)
+        yield from _report(paths, results, errors)
+        return
+
+    executor: Executor = (
+        ProcessPoolExecutor(max_workers=workers)
+        if processes
+        else ThreadPoolExecutor(max_workers=workers)
+    )
+    try:
+        yield from _report(paths, _imap(executor, read, batches, 2 * workers), errors)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _read_json_batch(
+    paths: list[Path], check_duplicates: bool, backend: Optional[str]
+) -> list[tuple[Any, Optional[Exception]]]:
+    results: list[tuple[Any, Optional[Exception]]] = []
+    for path in paths:
+        try:
+            results.append((read_json(path, check_duplicates, backend), None))
+        except (OSError, ValueError, AssertionError) as e:
+            results.append((None, e))
+    return results
+
+
+def _imap(executor: Executor, func, items, window: int) -> Iterator:
+    # Like executor.map, but submits at most `window` items ahead so that the items are consumed lazily.
+    pending: deque = deque(
+        executor.submit(func, item) for item in islice(items, window)
+    )
+    for item in items:
+        yield pending.popleft().result()
+        pending.append(executor.submit(func, item))
+    while pending:
+        yield pending.popleft().result()
+
+
+def _report(
+    paths: list[Path],
+    results: Iterator[list[tuple[Any, Optional[Exception]]]],
+    errors: Optional[dict[Path, Exception]],
+) -> Iterator[tuple[Path, Any]]:
+    flat = (result for batch in results for result in batch)
+    for path, (data, error) in zip(paths, flat):
+        if error is None:
+            yield path, data
+        elif errors is not None:
+            errors[path] = error
+        else:
+            warnings.warn(f"Failed to load '{path}': {error}")
 
 
 def read_text(path: Path | str) -> str:
@@ -26,3 +203,32 @@ def read_text(path: Path | str) -> str:
         data = f.read()
     data = data.rstrip()
     return data
+
+
+def iter_text(
+    path: Path | str, chunk_size: int = 1 << 20, encoding: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Reads a text file in pieces of about `chunk_size` characters, so that a large file is never held in memory.
+
+    The pieces never split a multibyte character, and their concatenation is the same as `read_text(path)`:
+    the trailing whitespace of the file is dropped by holding back the trailing whitespace of each piece
+    until more text follows it. The pieces can be passed to e.g. `Tokenizer.count_tokens_iter`.
+
+    Args:
+        path (Path | str): The path of the text file.
+        chunk_size (int, optional): The number of characters read at once. Defaults to 1 MiB.
+        encoding (Optional[str], optional): The encoding of the file, as in `open`. Defaults to None.
+
+    Yields:
+        str: Each piece of the text.
+    """
+    pending = ""
+    with open(path, "r", encoding=encoding) as f:
+        while chunk := f.read(chunk_size):
+            stripped = chunk.rstrip()
+            if stripped:
+                yield pending + stripped if pending else stripped
+                pending = chunk[len(stripped) :]
+            else:
+                pending += chunk
@@ -1,5 +1,6 @@
 from .utils import (
     Num,
+    ValueCleaner,
     categorize_labels,
     categorize_labels_with_dct,
     clean_values,
@@ -1,5 +1,6 @@
 from collections import Counter, defaultdict
-from typing import TypeAlias, cast
+from functools import lru_cache
+from typing import Iterable, TypeAlias, cast
 
 Num: TypeAlias = int | float | bool
 DEFAULT_KEY = [
@@ -94,21 +95,80 @@ def clean_values(
         A cleaned dictionary containing only bool, int, or float values.
 
     """
-    assert isinstance(dct, dict), "'dct' must be a dict"
-    ret_dct: dict[str, Num] = {}
+    cleaner = _DEFAULT_CLEANER if key_lst is DEFAULT_KEY else _cleaner(tuple(key_lst))
+    return cleaner(dct)
 
-    for k in key_lst:
-        if k not in dct:
-            continue
-        v = dct[k]
-        if v is None or v is False:
-            continue
-        if isinstance(v, int | float | bool):
-            ret_dct[k] = v
-        else:
-            raise ValueError("Value must be a bool, int, or float")
 
-    return ret_dct
+class ValueCleaner:
+    """
+    A cleaner compiled from a list of keys, which cleans dictionaries as `clean_values` does.
+
+    The keys are deduplicated and mapped to their positions in the list once. Cleaning a dictionary looks up
+    each key of the list once, or only the keys of the dictionary when it is much smaller than the list.
+
+    Parameters
+    ----------
+    key_lst : list[str], optional
+        A list of keys. The default is DEFAULT_KEY.
+
+    """
+
+    def __init__(self, key_lst: list[str] = DEFAULT_KEY) -> None:
+        self.keys: tuple[str, ...] = tuple(dict.fromkeys(key_lst))
+        self.slots: dict[str, int] = {k: i for i, k in enumerate(self.keys)}
+
+    def __call__(self, dct: dict[str, Num]) -> dict[str, Num]:
+        """
+        Cleans a dictionary by removing any keys with None or False values and any keys that are not in the key list.
+
+        Parameters
+        ----------
+        dct : dict[str, Num]
+            A dictionaly to be cleaned.
+
+        Raises
+        ------
+        ValueError
+            If a value in the input dictionary is not a bool, int, or float.
+
+        Returns
+        -------
+        dict[str, Num]
+            A cleaned dictionary containing only bool, int, or float values, in the order of the key list.
+
+        """
+        assert isinstance(dct, dict), "'dct' must be a dict"
+        keys: Iterable[str] = self.keys
+        if len(dct) * 4 <= len(self.keys):
+            # Looking up the few keys of the dictionary and sorting them by slot is cheaper than scanning the key list.
+            slots = self.slots
+            keys = [k for k in dct if k in slots]
+            keys.sort(key=slots.__getitem__)
+
+        ret_dct: dict[str, Num] = {}
+        get = dct.get
+        for k in keys:
+            v = get(k)
+            # A missing key is skipped as a None value.
+            if v is None or v is False:
+                continue
+            if isinstance(v, _NUM_TYPES):
+                ret_dct[k] = v
+            else:
+                raise ValueError("Value must be a bool, int, or float")
+        return ret_dct
+
+
+_NUM_TYPES = (int, float, bool)
+
+
+@lru_cache(maxsize=128)
+def _cleaner(keys: tuple[str, ...]) -> ValueCleaner:
+    return ValueCleaner(list(keys))
+
+
+# Built once, so that cleaning with the default keys does not hash the key list on every call.
+_DEFAULT_CLEANER = ValueCleaner(DEFAULT_KEY)
 
 
 def categorize_labels(
@@ -186,11 +246,9 @@ def categorize_labels_with_dct(
     results_lst: list[dict[str, Num]] = (
         [results] if isinstance(results, dict) else results
     )
+    cleaner = _DEFAULT_CLEANER if keys is None else ValueCleaner(keys)
     for result in results_lst:
-        if keys is None:
-            cleaned_result = clean_values(result)
-        else:
-            cleaned_result = clean_values(result, keys)
+        cleaned_result = cleaner(result)
 
         for category, subs in label_category.items():
             is_single_category = True if len(subs) == 1 else False
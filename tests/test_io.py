@@ -1,11 +1,32 @@
+import asyncio
+import json
+import shutil
 import sys
+import time
+from pathlib import Path
 
 import pytest
 
 sys.path.append("../gptsenpy")
 
 
-from gptsenpy.io.read import read_json, read_text
+from gptsenpy.io.aio import aread_json, aread_text, gather_json, gather_text
+from gptsenpy.io.jsonl import (
+    JsonlWriter,
+    build_index,
+    index_path,
+    iter_jsonl,
+    read_index,
+    write_jsonl,
+)
+from gptsenpy.io.read import (
+    JSON_BACKENDS,
+    iter_text,
+    json_backend,
+    read_json,
+    read_json_dir,
+    read_text,
+)
 
 
 def test_read_json():
@@ -30,3 +51,153 @@ def test_duplicate_keys():
     with pytest.raises(AssertionError) as e:
         _ = read_json(data_path)
     assert str(e.value) == "Duplicate keys in JSON file."
+
+
+def test_read_json_backends():
+    data_path = "tests/data/annotation_format.json"
+    expected = read_json(data_path)
+    for backend in JSON_BACKENDS:
+        try:
+            backend = json_backend(backend)
+        except ImportError:
+            continue
+        assert read_json(data_path, check_duplicates=False, backend=backend) == expected
+    assert read_json(data_path, check_duplicates=False) == expected
+    with pytest.raises(ValueError):
+        _ = json_backend("yaml")
+
+
+def test_duplicate_keys_unchecked():
+    data_path = "tests/data/duplicate_keys.json"
+    data = read_json(data_path, check_duplicates=False, backend="json")
+    assert data["epochs"] == 150
+
+
+def test_read_json_dir():
+    data_path = Path("tests/data")
+    errors = {}
+    results = list(read_json_dir(data_path, errors=errors))
+    paths = sorted(data_path.glob("*.json"))
+    assert [path for path, _ in results] == [
+        path for path in paths if path.name != "duplicate_keys.json"
+    ]
+    assert results[0][1] == read_json(results[0][0])
+    assert list(errors) == [data_path / "duplicate_keys.json"]
+    assert isinstance(errors[data_path / "duplicate_keys.json"], AssertionError)
+    assert list(read_json_dir(data_path, errors={}, workers=1, batch_size=2)) == results
+
+
+def test_read_json_dir_processes(tmp_path):
+    for i in range(20):
+        shutil.copy("tests/data/hand_replacer.json", tmp_path / f"{i:02}.json")
+    (tmp_path / "broken.json").write_text("{")
+    errors = {}
+    results = list(
+        read_json_dir(tmp_path, workers=2, processes=True, errors=errors, batch_size=3)
+    )
+    assert len(results) == 20 and all(
+        data == {"name": "John", "age": "30"} for _, data in results
+    )
+    assert isinstance(errors[tmp_path / "broken.json"], ValueError)
+    with pytest.warns(UserWarning):
+        assert len(list(read_json_dir(tmp_path))) == 20
+
+
+@pytest.mark.parametrize("name", ["results.jsonl", "results.jsonl.gz"])
+def test_jsonl(tmp_path, name):
+    path = tmp_path / name
+    records = [{"id": i, "text": "日本語" * i} for i in range(10)]
+    assert write_jsonl(path, records[:6], index=True) == 6
+    with JsonlWriter(path, append=True, index=True) as writer:
+        for record in records[6:]:
+            writer.write(record)
+    assert writer.n_records == 10
+    assert list(iter_jsonl(path)) == records
+    assert len(read_index(path)) == 11
+    assert list(iter_jsonl(path, start=7)) == records[7:]
+    assert list(iter_jsonl(path, start=20)) == []
+
+    write_jsonl(path, [{"id": 10}], append=True)
+    assert read_index(path) is None
+    assert list(iter_jsonl(path, start=9)) == records[9:] + [{"id": 10}]
+    assert list(build_index(path)) == list(read_index(path))
+    assert index_path(path).name == name + ".idx"
+
+
+def test_jsonl_duplicate_keys(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text('{"a": 1}\n\n{"a": 1, "a": 2}\n')
+    with pytest.raises(AssertionError):
+        _ = list(iter_jsonl(path))
+    assert list(iter_jsonl(path, check_duplicates=False, backend="json")) == [
+        {"a": 1},
+        {"a": 2},
+    ]
+    assert list(iter_jsonl(path, start=1, check_duplicates=False)) == [{"a": 2}]
+
+
+def test_iter_text(tmp_path):
+    path = tmp_path / "corpus.txt"
+    path.write_text(
+        "日本語の論文。\n  \n" * 5 + "English text.  \t\n\n" * 5 + " \n\n  ",
+        encoding="utf-8",
+    )
+    for source in [path, "tests/data/hand_prompt.txt"]:
+        expected = read_text(source)
+        for chunk_size in [1, 3, 7, 1 << 20]:
+            pieces = list(iter_text(source, chunk_size=chunk_size, encoding="utf-8"))
+            assert "".join(pieces) == expected
+            assert all(pieces)
+    (tmp_path / "empty.txt").write_text(" \n")
+    assert list(iter_text(tmp_path / "empty.txt")) == []
+
+
+def test_async_read():
+    async def main():
+        data = await aread_json("tests/data/hand_replacer.json")
+        text = await aread_text("tests/data/hand_prompt.txt")
+        paths = ["tests/data/hand_replacer.json", "tests/data/duplicate_keys.json"]
+        results = await gather_json(paths, limit=1, return_exceptions=True)
+        with pytest.raises(AssertionError):
+            _ = await gather_json(paths)
+        texts = await gather_text(["tests/data/hand_prompt.txt"] * 3)
+        return data, text, results, texts
+
+    data, text, results, texts = asyncio.run(main())
+    assert data == read_json("tests/data/hand_replacer.json")
+    assert text == read_text("tests/data/hand_prompt.txt")
+    assert results[0] == data and isinstance(results[1], AssertionError)
+    assert texts == [text] * 3
+
+
+def test_async_read_responsive(tmp_path):
+    record = {f"key{i}": "value" * 4 for i in range(20000)}
+    for i in range(30):
+        (tmp_path / f"{i}.json").write_text(json.dumps(record))
+    paths = sorted(tmp_path.glob("*.json"))
+
+    async def main():
+        gaps = []
+        done = asyncio.Event()
+
+        async def ticker():
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.001)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        results = await gather_json(paths, limit=4)
+        elapsed = time.perf_counter() - start
+        done.set()
+        await task
+        return results, gaps, elapsed
+
+    results, gaps, elapsed = asyncio.run(main())
+    assert results == [record] * len(paths)
+    # The event loop kept running while the files were parsed in the executor.
+    assert len(gaps) >= 3
+    assert max(gaps) < elapsed / 2
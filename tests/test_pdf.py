@@ -1,3 +1,5 @@
+import os
+import re
 import sys
 from pathlib import Path
 
@@ -7,7 +9,7 @@ sys.path.append("../gptsenpy")
 DATA_PATH = Path("tests/data")
 
 
-from gptsenpy.PDFLoader import PDFLoader
+from gptsenpy.PDFLoader import DocumentPool, PDFCache, PDFLoader, TextNormalizer
 from gptsenpy.Tokenizer import Tokenizer
 
 
@@ -86,3 +88,236 @@ def test_get_page_text_by_range_1():
     _ = pdfloader.get_page_text_by_range(3, 2)
     _ = pdfloader.get_page_text_by_range(3, 4)
     _ = pdfloader.get_page_text_by_range(3, 9)
+
+
+def test_load_many_1():
+    pdf_paths = [DATA_PATH / "AA.pdf", DATA_PATH / "DAMO-YOLO.pdf"]
+    texts = PDFLoader.load_many(pdf_paths, workers=2)
+    assert texts == [PDFLoader(pdf_path).get_page_text(-1) for pdf_path in pdf_paths]
+
+
+def test_load_many_2():
+    pdf_paths = [DATA_PATH / "AA.pdf", DATA_PATH / "not_exist.pdf"]
+    with pytest.warns(UserWarning, match="not_exist.pdf"):
+        texts = PDFLoader.load_many(pdf_paths, workers=2)
+    assert texts[0] == PDFLoader(pdf_paths[0]).get_page_text(-1)
+    assert texts[1] is None
+
+
+def test_load_many_3(tmp_path):
+    pdf_paths = [DATA_PATH / "AA.pdf", DATA_PATH / "DAMO-YOLO.pdf"]
+    cache = PDFCache(tmp_path)
+    texts = PDFLoader.load_many(pdf_paths, workers=2, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert PDFLoader.load_many(pdf_paths, workers=2, cache=cache) == texts
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_iter_pages_1():
+    pdf_path = DATA_PATH / "AA.pdf"
+    pdfloader = PDFLoader(pdf_path)
+    pages = list(pdfloader.iter_pages())
+    assert len(pages) == 13
+    assert " ".join(pages) == pdfloader.get_page_text(-1)
+    assert list(pdfloader.iter_pages(3, 4)) == [
+        pdfloader.get_page_text(3),
+        pdfloader.get_page_text(4),
+    ]
+    with pytest.raises(AssertionError, match="Invalid page range"):
+        _ = next(pdfloader.iter_pages(0, 12))
+
+
+def test_iter_sections_1():
+    pdf_path = DATA_PATH / "SS.pdf"
+    pdfloader = PDFLoader(pdf_path)
+    text = pdfloader.get_page_text(-1)
+    for pattern in [r"(?<=\.\s)(?=\d+\.\s?[A-Z])", r"\.\s+", r"(?=\d)"]:
+        expected = [section.strip() for section in re.split(pattern, text)]
+        assert list(pdfloader.iter_sections(pattern)) == expected
+
+
+def test_iter_sections_2():
+    pdf_path = DATA_PATH / "AA.pdf"
+    pdfloader = PDFLoader(pdf_path)
+    text = pdfloader.get_page_text(-1)
+    for pattern in [r"no such section", r"\s*", r"(?<=\.)\s+(?=[A-Z])"]:
+        expected = [section.strip() for section in re.split(pattern, text)]
+        assert list(pdfloader.iter_sections(pattern)) == expected
+
+
+def test_iter_divide_sections_1():
+    pdf_path = DATA_PATH / "AA.pdf"
+    pdfloader = PDFLoader(pdf_path)
+    tokenizer = Tokenizer("gpt-3.5-turbo")
+    ret = list(
+        tokenizer.iter_divide_text_by_max_token(
+            pdfloader.iter_sections(), max_tokens=2000
+        )
+    )
+    expected = []
+    for section in pdfloader.split_sections():
+        expected.extend(tokenizer.divide_text_by_max_token(section, max_tokens=2000))
+    assert ret == expected
+
+
+def test_cache_1(tmp_path):
+    pdf_path = DATA_PATH / "AA.pdf"
+    cache = PDFCache(tmp_path)
+    expected = PDFLoader(pdf_path).get_page_text(-1)
+    assert PDFLoader(pdf_path, cache).get_page_text(-1) == expected
+    assert (cache.hits, cache.misses) == (0, 1)
+    pdfloader = PDFLoader(pdf_path, cache)
+    assert pdfloader.get_page_text(-1) == expected
+    assert pdfloader.get_page_text_by_range(3, 4) == PDFLoader(
+        pdf_path
+    ).get_page_text_by_range(3, 4)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_2(tmp_path):
+    cache = PDFCache(tmp_path, max_bytes=0)
+    _ = PDFLoader(DATA_PATH / "AA.pdf", cache).get_page_text(-1)
+    assert list(tmp_path.iterdir()) == []
+    _ = PDFLoader(DATA_PATH / "AA.pdf", cache).get_page_text(-1)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_cache_3(tmp_path, monkeypatch):
+    cache = PDFCache(tmp_path, max_bytes=0)
+    (tmp_path / "b.jsonl.gz").write_bytes(b"not gzip")
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # Another process removes an entry after it is listed and before it is evicted.
+    entries = list(os.scandir(tmp_path))
+    for entry in entries:
+        os.remove(entry.path)
+    monkeypatch.setattr(os, "scandir", lambda directory: iter(entries))
+    cache.evict()
+    monkeypatch.undo()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_lazy_open_1():
+    pdfloader = PDFLoader(DATA_PATH / "AA.pdf")
+    assert pdfloader._doc is None
+    assert pdfloader.page_count == 13
+    assert pdfloader._doc is not None
+    pdfloader.close()
+    assert pdfloader._doc is None
+    with PDFLoader(DATA_PATH / "AA.pdf") as pdfloader:
+        text = pdfloader.get_page_text(1)
+    assert pdfloader._doc is None
+    assert text == PDFLoader(DATA_PATH / "AA.pdf").get_page_text(1)
+
+
+def test_lazy_open_2(tmp_path):
+    cache = PDFCache(tmp_path)
+    _ = PDFLoader(DATA_PATH / "AA.pdf", cache).get_page_text(-1)
+    pdfloader = PDFLoader(DATA_PATH / "AA.pdf", cache)
+    _ = pdfloader.get_page_text(-1)
+    assert pdfloader.page_count == 13
+    assert pdfloader._doc is None
+
+
+def test_document_pool_1():
+    pdf_paths = [
+        DATA_PATH / "AA.pdf",
+        DATA_PATH / "DAMO-YOLO.pdf",
+        DATA_PATH / "SS.pdf",
+    ]
+    with DocumentPool(maxsize=2) as pool:
+        pdfloaders = [PDFLoader(pdf_path, pool=pool) for pdf_path in pdf_paths]
+        assert len(pool) == 0
+        texts = [pdfloader.get_page_text(1) for pdfloader in pdfloaders]
+        assert len(pool) == 2
+        assert pdf_paths[0] not in pool
+        assert pdfloaders[0].get_page_text(1) == texts[0]
+        assert pdf_paths[0] in pool and pdf_paths[1] not in pool
+    assert len(pool) == 0
+
+
+def test_text_normalizer_1():
+    normalizer = TextNormalizer()
+    for text in [
+        "",
+        "\n",
+        "a\n\nb\n",
+        "Hyphen-\nated and trailing-\n",
+        "dash - here\r\nand\x0cthere",
+        "日本語\nの\u2028テキスト\x85です\n",
+        "日本語\nのテキスト\n",
+    ]:
+        assert normalizer(text) == (" ".join(text.splitlines())).replace("- ", "")
+
+
+def test_text_normalizer_2():
+    normalizer = TextNormalizer(
+        dehyphenate=False, keep_paragraphs=True, fix_ligatures=True
+    )
+    text = "The ﬁrst para-\ngraph.\n  \nThe second\nparagraph.\n"
+    assert normalizer(text) == "The first para- graph.\n\nThe second paragraph."
+
+
+def test_text_normalizer_3(tmp_path):
+    pdf_path = DATA_PATH / "AA.pdf"
+    cache = PDFCache(tmp_path)
+    normalizer = TextNormalizer(dehyphenate=False)
+    _ = PDFLoader(pdf_path, cache).get_page_text(-1)
+    pdfloader = PDFLoader(pdf_path, cache, normalizer=normalizer)
+    assert pdfloader.get_page_text(1) == " ".join(
+        pdfloader.doc.get_page_text(0).splitlines()
+    )
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_section_index_1():
+    pdf_path = DATA_PATH / "AA.pdf"
+    pdfloader = PDFLoader(pdf_path)
+    text = pdfloader.get_page_text(-1)
+    index = pdfloader.section_index()
+    assert len(index) == 6
+    assert pdfloader.section_index() is index
+    assert pdfloader.split_sections() == [section.text for section in index]
+    for section in index:
+        assert text[section.start : section.end] == section.text
+        assert 1 <= section.start_pno <= section.end_pno <= pdfloader.page_count
+    assert index[0].start_pno == 1 and index[-1].end_pno == 13
+    assert pdfloader.get_section(-1) == index[-1]
+
+
+def test_section_index_2():
+    # Capturing groups are sections of their own, as in re.split.
+    pdf_path = DATA_PATH / "AA.pdf"
+    pdfloader = PDFLoader(pdf_path)
+    text = pdfloader.get_page_text(-1)
+    pattern = r"(?<=\.\s)(\d+)\.\s?(?=[A-Z])"
+    expected = [section.strip() for section in re.split(pattern, text)]
+    assert len(expected) == 11
+    assert list(PDFLoader(pdf_path).iter_sections(pattern)) == expected
+    assert pdfloader.split_sections(pattern) == expected
+    for section in pdfloader.section_index(pattern):
+        assert text[section.start : section.end] == section.text
+
+
+def test_iter_blocks_1():
+    pdfloader = PDFLoader(DATA_PATH / "AA.pdf")
+    blocks = list(pdfloader.iter_blocks(1, 1))
+    assert all(block.pno == 1 for block in blocks)
+    assert blocks[0].text == "Attention Augmented Convolutional Networks"
+    # The rotated arXiv stamp on the first page is dropped.
+    assert not any(block.text.startswith("arXiv:") for block in blocks)
+
+
+def test_layout_sections_1():
+    pdfloader = PDFLoader(DATA_PATH / "AA.pdf")
+    sections = pdfloader.layout_sections()
+    titles = [section.title for section in sections]
+    assert "1. Introduction" in titles
+    assert "A. Appendix" in titles
+    assert "References" not in titles
+    assert sum(len(section.text) for section in sections) < len(
+        pdfloader.get_page_text(-1)
+    )
+    sections = pdfloader.layout_sections(skip_references=False)
+    assert "References" in [section.title for section in sections]
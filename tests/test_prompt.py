@@ -5,7 +5,14 @@ sys.path.append("../gptsenpy")
 
 from pytest import raises, warns
 
-from gptsenpy.Prompt import PromptTemplate
+from gptsenpy.Prompt import (
+    CompiledTemplate,
+    PromptBudgetPlanner,
+    PromptResult,
+    PromptTemplate,
+    TemplateRegistry,
+)
+from gptsenpy.Tokenizer import Tokenizer
 
 
 def test_build_prompt_valid_template():
@@ -77,5 +84,168 @@ def test_template_not_equal():
     assert PT.template != different_template
 
 
+def test_compiled_template():
+    template = "Hello, ${name}! $$5 for {braces} and $name again, ${age}."
+    compiled = CompiledTemplate(template)
+    assert compiled.placeholders == ("name", "age")
+    assert compiled.keys == {"name", "age"}
+    assert compiled.missing({"name": "John"}) == ["age"]
+    assert compiled.missing({"name": "John", "age": 30}) == []
+    replacer = {"name": "John", "age": 30}
+    expected = "Hello, John! $5 for {braces} and John again, 30."
+    assert compiled.render(replacer) == expected
+    assert PromptTemplate(template).build_prompt(replacer) == expected
+    with raises(KeyError):
+        compiled.render({"name": "John"})
+    with raises(ValueError):
+        CompiledTemplate("Price: $ 5 for ${name}").render({"name": "John"})
+
+
+def test_compiled_template_setter():
+    PT = PromptTemplate("Hello, ${name}!")
+    compiled = PT.compile()
+    assert PT.compile() is compiled
+    PT.template = "Hi, ${name}!"
+    assert PT.compile() is not compiled
+    assert PT.build_prompt({"name": "John"}) == "Hi, John!"
+
+
+def test_build_prompts():
+    PT = PromptTemplate("Hello, my name is ${name} and I am ${age} years old.")
+    replacers = [
+        {"name": "John", "age": "30"},
+        {"name": "Jane"},
+        {"name": "Bob", "age": 40},
+    ]
+    results = list(PT.build_prompts(replacers))
+    assert [result.row for result in results] == [0, 1, 2]
+    assert results[0] == PromptResult(0, PT.build_prompt(replacers[0]), None)
+    assert results[1].prompt is None and isinstance(results[1].error, KeyError)
+    assert results[2].prompt == "Hello, my name is Bob and I am 40 years old."
+
+    columns = {"name": ["John", "Jane", "Bob"], "age": ["30", "25", 40]}
+    prompts = [result.prompt for result in PT.build_prompts(columns)]
+    assert prompts[1] == "Hello, my name is Jane and I am 25 years old."
+    with raises(ValueError):
+        _ = list(PT.build_prompts({"name": ["John"], "age": []}))
+
+
+def test_build_prompts_workers():
+    PT = PromptTemplate("${name} is ${age}.")
+    replacers = (
+        {"name": str(i), "age": i} if i % 7 else {"name": str(i)} for i in range(100)
+    )
+    results = list(PT.build_prompts(replacers, workers=2, batch_size=8))
+    assert [result.row for result in results] == list(range(100))
+    assert all((result.error is None) == bool(result.row % 7) for result in results)
+    assert results[1].prompt == "1 is 1."
+
+
+def test_template_registry(tmp_path):
+    (tmp_path / "hello.txt").write_text("Hello, ${name}!\n")
+    registry = TemplateRegistry(tmp_path, check_interval=0)
+    assert registry.names() == ["hello"] and "hello" in registry
+    template = registry.get("hello")
+    assert registry.get("hello") is template
+    assert registry.build_prompt("hello", {"name": "John"}) == "Hello, John!"
+
+    (tmp_path / "hello.txt").write_text("Hi, ${name}!")
+    assert registry.get("hello") is not template
+    assert registry.build_prompt("hello", {"name": "John"}) == "Hi, John!"
+
+    (tmp_path / "bye.txt").write_text("Bye, ${name}!")
+    assert registry.build_prompt("bye", {"name": "John"}) == "Bye, John!"
+    with raises(KeyError):
+        _ = registry.get("missing")
+
+
+def test_template_registry_check_interval(tmp_path):
+    (tmp_path / "hello.txt").write_text("Hello, ${name}!")
+    registry = TemplateRegistry(tmp_path, check_interval=None)
+    template = registry.get("hello")
+    (tmp_path / "hello.txt").write_text("Hi, ${name}!!")
+    assert registry.get("hello") is template
+    registry.reload()
+    assert registry.build_prompt("hello", {"name": "John"}) == "Hi, John!!"
+
+
+def test_build_prompt_with_budget():
+    tokenizer = Tokenizer("gpt-4")
+    PT = PromptTemplate(
+        "Title: ${title}\nAbstract: ${abstract}\nBody: ${body}\nAnswer:"
+    )
+    replacer = {
+        "title": "GPT Senpy",
+        "abstract": "We read papers. " * 20,
+        "body": "日本語の本文です。" * 50,
+    }
+    prompt, n_tokens = PT.build_prompt_with_budget(replacer, tokenizer)
+    assert prompt == PT.build_prompt(replacer)
+    assert n_tokens == tokenizer.count_tokens(prompt)
+
+    prompt, n_tokens = PT.build_prompt_with_budget(
+        replacer, tokenizer, budgets={"abstract": 10}
+    )
+    assert n_tokens == tokenizer.count_tokens(prompt)
+    assert "日本語の本文です。" * 50 in prompt
+    assert "Abstract: We" in prompt and "We read papers. " * 20 not in prompt
+
+    full = tokenizer.count_tokens(PT.build_prompt(replacer))
+    for max_tokens in [full, full - 1, full // 2, full // 4]:
+        prompt, n_tokens = PT.build_prompt_with_budget(
+            replacer, tokenizer, max_tokens=max_tokens, priority=["abstract", "body"]
+        )
+        assert n_tokens == tokenizer.count_tokens(prompt) <= max_tokens
+        assert prompt.startswith("Title: GPT Senpy\nAbstract: We")
+    assert "\ufffd" not in prompt
+
+    with raises(ValueError):
+        _ = PT.build_prompt_with_budget(
+            replacer, tokenizer, max_tokens=3, priority=["body"]
+        )
+    with raises(KeyError):
+        _ = PT.build_prompt_with_budget({"title": ""}, tokenizer, budgets={"body": 10})
+
+
+def test_prompt_budget_planner():
+    tokenizer = Tokenizer("gpt-4")
+    template = PromptTemplate("Summarize the paper ${title}.\n\n${text}\n\nSummary:")
+    planner = PromptBudgetPlanner(
+        template, tokenizer, context_size=400, completion_tokens=20
+    )
+    replacer = {"title": "GPT Senpy"}
+    overhead = planner.overhead(replacer)
+    assert overhead == tokenizer.count_tokens(
+        template.build_prompt({**replacer, "text": ""})
+    )
+    assert planner.budget(replacer) == 400 - 20 - overhead - planner.margin
+
+    text = " ".join(f"This is sentence number {i}." for i in range(50))
+    for chunk in planner.split(text, replacer):
+        prompt = template.build_prompt({**replacer, "text": chunk.text})
+        assert tokenizer.count_tokens(prompt) <= 400 - 20
+
+    sections = [f"Section {i}. " + "Some text. " * i for i in range(10)]
+    documents = planner.pack(sections, replacer)
+    assert len(documents) < len(sections)
+    assert "\n\n".join(documents) == "\n\n".join(sections)
+    assert len(planner.pack([text], replacer)) > 1
+    for document in documents + planner.pack([text], replacer):
+        prompt = template.build_prompt({**replacer, "text": document})
+        assert tokenizer.count_tokens(prompt) <= 400 - 20
+
+    with raises(ValueError):
+        _ = PromptBudgetPlanner(template, tokenizer, context_size=10).budget(replacer)
+    with raises(KeyError):
+        _ = planner.overhead()
+
+    # The document in the slot is not part of the cache key, and values need not be hashable.
+    assert planner.overhead({**replacer, "text": text}) == overhead
+    assert len(planner._overheads) == 1
+    assert planner.overhead({"title": ["GPT", "Senpy"]}) == tokenizer.count_tokens(
+        template.build_prompt({"title": ["GPT", "Senpy"], "text": ""})
+    )
+
+
 if __name__ == "__main__":
     pass
@@ -1,10 +1,22 @@
+import base64
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append("../gptsenpy")
 
 from pytest import raises, warns
 
-from gptsenpy.Tokenizer import Tokenizer
+from gptsenpy.io import iter_text, read_text
+from gptsenpy.PDFLoader import PDFLoader
+from gptsenpy.Tokenizer import (
+    Tokenizer,
+    get_encoding,
+    load_seconds,
+    preload,
+    registry,
+    vocab,
+    warm_up,
+)
 
 model = "gpt-4"
 text = "Hello, my name is John"
@@ -24,3 +36,239 @@ def test_count_tokenizer():
 def test_error_count_tokenizer():
     with raises(ValueError):
         _ = tokenizer.count_tokens(10000000)
+
+
+def test_count_tokens_batch():
+    texts = [text, "", "Hello, world!", text * 10]
+    assert tokenizer.count_tokens_batch(texts, num_threads=2) == [
+        tokenizer.count_tokens(t) for t in texts
+    ]
+    with raises(ValueError):
+        _ = tokenizer.count_tokens_batch([text, 10000000])
+
+
+def test_encode_batch():
+    texts = [text, "Hello, world!"]
+    assert tokenizer.encode_batch(texts) == [tokenizer._encode(t) for t in texts]
+
+
+def test_divide_batch():
+    texts = [text * 10, "", "Hello, world!"]
+    assert tokenizer.divide_batch(texts, max_tokens=7) == [
+        tokenizer.divide_text_by_max_token(t, max_tokens=7) for t in texts
+    ]
+
+
+def test_get_encoding():
+    assert get_encoding(model) is tokenizer.tokenizer
+    assert Tokenizer(model).tokenizer is tokenizer.tokenizer
+    assert get_encoding("cl100k_base").name == "cl100k_base"
+    with raises(KeyError):
+        _ = get_encoding("not_exist")
+
+
+def test_warm_up():
+    # The encoding of `model` is already loaded by the module-level tokenizer.
+    assert warm_up([model]) == {model: 0.0}
+    assert model in load_seconds()
+
+
+def write_bpe(path, words):
+    # A byte-level vocabulary in which each of `words` is a single token.
+    ranks = {bytes([i]): i for i in range(256)}
+    for word in words:
+        data = word.encode()
+        for i in range(2, len(data) + 1):
+            ranks.setdefault(data[:i], len(ranks))
+    with open(path, "w") as f:
+        for token, rank in ranks.items():
+            f.write(f"{base64.b64encode(token).decode()} {rank}\n")
+
+
+def test_preload(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "_ENCODINGS", {})
+    monkeypatch.setattr(vocab, "_TABLES", {})
+    with raises(FileNotFoundError):
+        _ = preload(tmp_path)
+    write_bpe(tmp_path / "cl100k_base.tiktoken", ["Hello"])
+    with raises(ValueError):
+        _ = preload(tmp_path)
+
+    assert list(preload(tmp_path, verify=False)) == ["cl100k_base"]
+    encoding = get_encoding(model)
+    assert encoding is get_encoding("cl100k_base")
+    assert encoding.name == "cl100k_base"
+    assert encoding.encode("Hello, world") == [259, 44] + list(b" world")
+    assert encoding.encode("<|endoftext|>", allowed_special="all") == [100257]
+    assert Tokenizer(model).count_tokens("Hello") == 1
+
+
+def test_cache():
+    cached_tokenizer = Tokenizer(model, cache_size=2)
+    assert tokenizer.cache_info() is None
+    assert cached_tokenizer.count_tokens(text) == tokenizer.count_tokens(text)
+    assert cached_tokenizer.count_tokens(text) == tokenizer.count_tokens(text)
+    assert cached_tokenizer.tokenize(text) == tokenizer.tokenize(text)
+    info = cached_tokenizer.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+    assert info.hit_rate == 2 / 3
+
+    _ = cached_tokenizer.count_tokens("a")
+    _ = cached_tokenizer.count_tokens("b")
+    assert cached_tokenizer.cache_info().currsize == 2
+    _ = cached_tokenizer.count_tokens(text)
+    assert cached_tokenizer.cache_info().misses == 4
+
+    cached_tokenizer.cache_clear()
+    assert cached_tokenizer.cache_info() == (0, 0, 2, 0)
+
+
+def test_cache_threads():
+    cached_tokenizer = Tokenizer(model, cache_size=8)
+    texts = [f"{text} {i % 4}" for i in range(200)]
+    with ThreadPoolExecutor(8) as executor:
+        counts = list(executor.map(cached_tokenizer.count_tokens, texts))
+    assert counts == [tokenizer.count_tokens(t) for t in texts]
+    info = cached_tokenizer.cache_info()
+    assert info.hits + info.misses == 200 and info.currsize == 4
+
+
+def test_divide_text_by_boundary():
+    sentences = [f"This is sentence number {i}." for i in range(20)]
+    long_text = " ".join(sentences)
+    chunks = tokenizer.divide_text_by_boundary(long_text, max_tokens=60)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.n_tokens <= 60
+        assert chunk.n_tokens == tokenizer.count_tokens(chunk.text)
+        assert long_text[chunk.start : chunk.end] == chunk.text
+        assert chunk.text.strip().endswith(".")
+    assert "".join(chunk.text for chunk in chunks) == long_text
+    assert tokenizer.divide_text_by_boundary("") == []
+
+
+def test_divide_text_by_boundary_overlap():
+    sentences = [f"This is sentence number {i}." for i in range(20)]
+    long_text = " ".join(sentences)
+    chunks = tokenizer.divide_text_by_boundary(long_text, max_tokens=60, overlap=30)
+    assert len(chunks) > 1
+    for prev, chunk in zip(chunks, chunks[1:]):
+        assert chunk.n_tokens <= 60
+        assert prev.start < chunk.start < prev.end
+    with raises(AssertionError):
+        _ = tokenizer.divide_text_by_boundary(long_text, max_tokens=60, overlap=60)
+
+
+def test_divide_text_by_boundary_long_sentence():
+    long_text = "word " * 100
+    chunks = tokenizer.divide_text_by_boundary(long_text, max_tokens=30)
+    assert all(chunk.n_tokens <= 30 for chunk in chunks)
+    assert "".join(chunk.text for chunk in chunks) == long_text
+
+
+def test_divide_text_by_boundary_japanese():
+    long_text = "日本語の論文を読む。形態素解析と𠮷野家、トークン化を行う。" * 40
+    chunks = tokenizer.divide_text_by_boundary(long_text, max_tokens=25)
+    for chunk in chunks:
+        assert chunk.n_tokens <= 25
+        assert chunk.n_tokens == tokenizer.count_tokens(chunk.text)
+    assert "".join(chunk.text for chunk in chunks) == long_text
+
+    # The boundary is before "。", which tiktoken attaches to the letters after it.
+    chunks = tokenizer.divide_text_by_boundary(long_text, max_tokens=200)
+    assert len(chunks) > 1
+    assert all(chunk.text.startswith("。") for chunk in chunks[1:])
+
+
+def test_divide_text_by_boundary_no_spaces():
+    long_text = "𠮷野家のthe牛丼" * 50
+    for max_tokens in (5, 6, 7, 50):
+        chunks = tokenizer.divide_text_by_boundary(long_text, max_tokens=max_tokens)
+        for chunk in chunks:
+            assert chunk.n_tokens <= max_tokens
+            assert chunk.n_tokens == tokenizer.count_tokens(chunk.text)
+        assert "".join(chunk.text for chunk in chunks) == long_text
+
+
+def test_divide_text_by_boundary_pretokenizer(tmp_path, monkeypatch):
+    # Tokens which merge across the sentence boundaries under cl100k's pre-tokenizer,
+    # which attaches "。" to the following letters and newlines to the preceding ".".
+    monkeypatch.setattr(registry, "_ENCODINGS", {})
+    monkeypatch.setattr(vocab, "_TABLES", {})
+    write_bpe(
+        tmp_path / "cl100k_base.tiktoken", ["。形", "。日", ".\n\n", "\n\n", " This"]
+    )
+    _ = preload(tmp_path, verify=False)
+    bpe_tokenizer = Tokenizer(model)
+    for long_text in [
+        "日本語の論文を読む。形態素解析と𠮷野家、トークン化を行う。" * 40,
+        "".join(f"This is sentence number {i}.\n\n" for i in range(40)),
+        "".join(f"This is sentence {i}. This is not.\n" for i in range(40)),
+    ]:
+        for max_tokens in (10, 25, 100):
+            chunks = bpe_tokenizer.divide_text_by_boundary(long_text, max_tokens)
+            for chunk in chunks:
+                assert chunk.n_tokens <= max_tokens
+                assert chunk.n_tokens == bpe_tokenizer.count_tokens(chunk.text)
+            assert "".join(chunk.text for chunk in chunks) == long_text
+
+
+def test_plan_chunks():
+    long_text = "日本語のテキストとEnglish text. " * 50
+    plan = tokenizer.plan_chunks(long_text, max_tokens=7)
+    assert plan.n_tokens == tokenizer.count_tokens(long_text)
+    assert plan.n_chars == len(long_text)
+    assert len(plan) == -(-plan.n_tokens // 7)
+    texts = tokenizer.divide_text_by_max_token(long_text, max_tokens=7)
+    assert [chunk.text for chunk in plan] == texts
+    assert plan[0].char_start == 0 and plan[-1].char_end == len(long_text)
+    for prev, chunk in zip(plan, list(plan)[1:]):
+        assert prev.end == chunk.start and prev.char_end == chunk.char_start
+    assert list(plan[1].tokens) == list(plan.tokens[7:14])
+    with raises(IndexError):
+        _ = plan[len(plan)]
+    assert len(tokenizer.plan_chunks("")) == 0
+
+
+def test_tokenize_multibyte():
+    japanese = "日本語の論文を読む。𠮷野家"
+    tokens = tokenizer.tokenize(japanese)
+    token_bytes = tokenizer.tokenize_bytes(japanese)
+    assert b"".join(token_bytes) == japanese.encode("utf-8")
+    assert len(tokens) == len(token_bytes) == tokenizer.count_tokens(japanese)
+    if "\ufffd" in "".join(tokens):
+        with raises(UnicodeDecodeError):
+            _ = tokenizer.tokenize(japanese, errors="strict")
+    assert "".join(tokenizer.tokenize(text)) == text
+
+
+def test_tokenize_with_offsets():
+    for source in [text, "日本語の論文を読む。𠮷野家"]:
+        tokens, offsets = tokenizer.tokenize_with_offsets(source)
+        expected = tokenizer.tokenizer.decode_with_offsets(
+            tokenizer.tokenizer.encode(source)
+        )
+        assert offsets == expected[1]
+        assert len(tokens) == len(offsets)
+
+
+def test_count_tokens_iter():
+    pages = list(PDFLoader("tests/data/AA.pdf").iter_pages())
+    expected = tokenizer.count_tokens("".join(pages))
+    assert tokenizer.count_tokens_iter(pages) == expected
+    assert tokenizer.count_tokens_iter(pages, buffer_size=100) == expected
+    assert tokenizer.count_tokens_iter(iter(pages), buffer_size=1) == expected
+
+    japanese = "日本語の論文を読む。英語の論文も読む、そして書く。" * 20
+    lines = [japanese[i : i + 7] for i in range(0, len(japanese), 7)]
+    assert tokenizer.count_tokens_iter(lines, buffer_size=16) == tokenizer.count_tokens(
+        japanese
+    )
+    assert tokenizer.count_tokens_iter([]) == 0
+
+    path = "tests/data/hand_prompt.txt"
+    assert tokenizer.count_tokens_iter(
+        iter_text(path, chunk_size=8), buffer_size=16
+    ) == tokenizer.count_tokens(read_text(path))
+    with raises(ValueError):
+        _ = tokenizer.count_tokens_iter([text, 1])
@@ -2,6 +2,8 @@ import json
 import sys
 
 sys.path.append("../gptsenpy")
+from pytest import raises
+
 from gptsenpy.io.read import read_json
 from gptsenpy.utils import (
     categorize_labels,
@@ -9,6 +11,7 @@ from gptsenpy.utils import (
     clean_values,
     uncategorize_dict_keys,
 )
+from gptsenpy.utils.utils import DEFAULT_KEY, ValueCleaner
 
 with open("tests/data/label_category.json", "r") as f:
     label_category = json.load(f)
@@ -80,6 +83,26 @@ def test_clean_values_4():
     assert clean_values(data, key_lst) == true_dct
 
 
+def test_value_cleaner():
+    data_path = (
+        "tests/data/DAMO-YOLO_A_Report_on_Real-Time_Object_Detection_Design.json"
+    )
+    data = read_json(data_path)
+    cleaner = ValueCleaner()
+    assert cleaner(data) == clean_values(data)
+    assert list(cleaner(data)) == [k for k in DEFAULT_KEY if k in cleaner(data)]
+
+    key_lst = ["epochs", "batchsize", "epochs", "not_exist"]
+    small = {"batchsize": 256, "epochs": 300, "FPS": None}
+    assert list(ValueCleaner(key_lst)(small)) == ["epochs", "batchsize"]
+    assert list(ValueCleaner(key_lst)({**small, "a": 1, "b": 2})) == [
+        "epochs",
+        "batchsize",
+    ]
+    with raises(ValueError):
+        cleaner({"epochs": "300"})
+
+
 def test_categorize_labels_0():
     dct1 = {
         "optim-optimizer-Adam": True,